@@ -5,21 +5,53 @@ Main entry point that registers all route blueprints and runs the Flask server.
 """
 
 import os
-import sys
-from flask import Flask, jsonify
+from concurrent.futures import ThreadPoolExecutor
+from flask import Flask, jsonify, request
 from dotenv import load_dotenv
 
-# Add the src directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
+# Load environment variables once at process start, before any module reads its settings
+load_dotenv()
 
 # Import blueprints
 from src.routes.submission_routes import submission_bp
 from src.routes.like_dislike_routes import like_dislike_bp
 from src.routes.user_routes import user_bp
+from src.db.connector import Connector
+from src.task_manager import close_task_manager
+from src.openai import openai_client
+from src.utils.json_provider import OrjsonProvider
 
-def create_app():
+def _check_database():
+    """Open and close one MySQL connection so connection problems surface at startup."""
+    cx = Connector()
+    cx.open_connection()
+    cx.close_connection()
+
+def prewarm():
+    """Build the shared OpenAI client and check the database concurrently before serving."""
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        futures = [executor.submit(openai_client.warm_up), executor.submit(_check_database)]
+        for future in futures:
+            future.result()
+
+def create_app(warm_up=False):
     """Create and configure the Flask application."""
     app = Flask(__name__)
+    app.json = OrjsonProvider(app)
+    app.config['MAX_CONTENT_LENGTH'] = 1024 * 1024
+    
+    @app.before_request
+    def reject_oversized_body():
+        """Answer 413 from the declared length, before any view reads or parses the body."""
+        if request.content_length is not None and request.content_length > app.config['MAX_CONTENT_LENGTH']:
+            return jsonify({
+                'error': 'Request body too large',
+                'success': False
+            }), 413
+    # Each request gets its own TaskManager (see get_task_manager); release its connections
+    app.teardown_request(close_task_manager)
+    if warm_up:
+        prewarm()
     
     # Register blueprints
     app.register_blueprint(submission_bp)
@@ -36,7 +68,10 @@ def create_app():
             'endpoints': {
                 'submission': {
                     'POST /generate_submission/': 'Generate submission content',
-                    'POST /generate_submission/individual_panel/': 'Generate panel-specific content'
+                    'POST /generate_submission/stream/': 'Generate submission content as server-sent events',
+                    'POST /generate_submission/individual_panel/': 'Generate panel-specific content',
+                    'POST /api/youtube/batch': 'Get several YouTube videos by ID',
+                    'POST /api/papers/batch': 'Get several papers by ID'
                 },
                 'like_dislike': {
                     'POST /like_dislike/': 'Like or dislike submission'
@@ -51,10 +86,9 @@ def create_app():
     return app
 
 if __name__ == '__main__':
-    # Load environment variables
-    load_dotenv()
-        
-    # Create and run the Flask app
-    app = create_app()
+    # Create and run the Flask app. Each request runs on its own thread, so a request
+    # waiting on MySQL, OpenAI or YouTube does not hold up the others. FLASK_DEBUG=0 turns
+    # off the reloader and debugger for load testing or deployment.
+    app = create_app(warm_up=True)
     print("Starting MemoScholar Flask Application...")
-    app.run(debug=True, host='0.0.0.0', port=5000)
\ No newline at end of file
+    app.run(debug=os.getenv('FLASK_DEBUG', '1') == '1', host='0.0.0.0', port=5000, threaded=True)
\ No newline at end of file
@@ -5,14 +5,18 @@ Uses content-based similarity (embeddings) to score and recommend papers.
 Similar to JaccardVideoRecommender but adapted for papers.
 """
 
+import heapq
 import pickle
 import os
+from operator import itemgetter
+import numpy as np
 from typing import List, Dict, Optional, Tuple
 from ..db.connector import Connector
 from ..db.db_crud.select_db import DBSelect
 from ..db.db_crud.insert import DBInsert
 from ..text_embedding.embedding import Embedding
 from ..utils.logging_config import get_logger
+from ..utils.background import submit_background
 
 logger = get_logger(__name__)
 
@@ -27,10 +31,11 @@ class CFPaperRecommender:
     Returns top-k recommendations with scores.
     """
     
-    def __init__(self, connector: Connector):
+    def __init__(self, connector: Connector, db_select: Optional[DBSelect] = None, db_insert: Optional[DBInsert] = None):
         self.connector = connector
-        self.db_select = DBSelect()
-        self.db_insert = DBInsert()
+        # Reuse the owning generator's DB helpers when given
+        self.db_select = db_select or DBSelect()
+        self.db_insert = db_insert or DBInsert()
         self.embedding = Embedding()
     
     def add_candidates(self, project_id: int, candidates: List[Dict]) -> List[int]:
@@ -83,42 +88,46 @@ class CFPaperRecommender:
             logger.warning(f"No papers found for project {project_id}")
             return []
         
-        # Score each paper
+        # Stored embeddings for every paper come back in one query
+        embeddings = self.db_select.get_paper_embeddings([paper['paper_id'] for paper in papers]) or {}
+        missing = [paper for paper in papers if paper['paper_id'] not in embeddings]
+        
+        # Embeddings for all of them are generated with one batched request and cached in
+        # the database after scoring; if that fails, those papers are left unscored
+        new_embeddings = {}
+        if missing:
+            try:
+                generated = self.embedding.embed_texts([self._paper_text(paper) for paper in missing])
+                new_embeddings = {paper['paper_id']: embedding for paper, embedding in zip(missing, generated)}
+            except Exception as e:
+                logger.error(f"Error embedding {len(missing)} papers: {str(e)}", exc_info=True)
+        if new_embeddings:
+            logger.info(f"Generated embeddings for {len(new_embeddings)} papers")
+        embeddings.update(new_embeddings)
+        
+        # Score every paper with one matrix-vector product
         scored_papers = []
-        for paper in papers:
+        scorable = [paper for paper in papers if paper['paper_id'] in embeddings]
+        if scorable:
             try:
-                paper_id = paper['paper_id']
-                paper_title = paper.get('paper_title', '')
-                paper_summary = paper.get('paper_summary', '')
-                
-                # Get or create paper embedding
-                paper_embedding = self.db_select.get_paper_embedding(paper_id)
-                
-                if paper_embedding is None:
-                    # Generate and cache embedding
-                    paper_text = f"{paper_title}; {paper_summary}"
-                    paper_embedding = self.embedding.embed_text(paper_text)
-                    self.db_insert.upsert_paper_embedding(paper_id, paper_embedding)
-                    logger.info(f"Generated and cached embedding for paper_id={paper_id}")
-                
-                # Compute cosine similarity
-                similarity = self.embedding.cosine_similarity(project_embedding, paper_embedding)
-                score = max(0.0, min(1.0, similarity))  # Clamp to [0, 1]
-                
-                scored_papers.append({
-                    'paper': paper,
-                    'score': score
-                })
-                
+                similarities = self.embedding.cosine_similarity_batch(
+                    project_embedding, [embeddings[paper['paper_id']] for paper in scorable]
+                )
+                scores = np.clip(similarities, 0.0, 1.0)  # Clamp to [0, 1]
+                scored_papers = [
+                    {'paper': paper, 'score': float(score)}
+                    for paper, score in zip(scorable, scores)
+                ]
             except Exception as e:
-                logger.error(f"Error scoring paper {paper.get('paper_id')}: {str(e)}", exc_info=True)
-                continue
+                logger.error(f"Error scoring papers: {str(e)}", exc_info=True)
         
-        # Sort by score (descending)
-        scored_papers.sort(key=lambda x: x['score'], reverse=True)
+        # The embedding cache is not needed for this response, so write it off the request thread
+        # (on its own DBInsert: the background worker must not share this request's connection)
+        if new_embeddings:
+            submit_background(DBInsert().upsert_paper_embeddings_bulk, new_embeddings)
         
-        # Get top-k
-        top_papers = scored_papers[:topk]
+        # Get top-k by score (descending) in O(N log k) without sorting every paper
+        top_papers = heapq.nlargest(topk, scored_papers, key=itemgetter('score'))
         
         # Log top scores
         top_scores_list = []
@@ -163,9 +172,14 @@ class CFPaperRecommender:
         logger.info(f"Returning {len(result)} recommendations")
         return result
     
-    def _get_unrecommended_papers(self, project_id: int) -> List[Dict]:
+    @staticmethod
+    def _paper_text(paper: Dict) -> str:
+        """The text a paper is embedded from: its title and summary."""
+        return f"{paper.get('paper_title', '')}; {paper.get('paper_summary', '')}"
+    
+    def _get_unrecommended_papers(self, project_id: int, limit: Optional[int] = None) -> List[Dict]:
         """
-        Get all papers for a project.
+        Get all papers for a project, newest first, or only the first `limit` of them.
         In the future, we could add a 'recommended' flag to filter.
         """
         self.connector.open_connection()
@@ -177,7 +191,11 @@ class CFPaperRecommender:
                 WHERE project_id = %s
                 ORDER BY paper_id DESC
             """
-            self.connector.cursor.execute(query, (project_id,))
+            params = (project_id,)
+            if limit is not None:
+                query += " LIMIT %s"
+                params = (project_id, limit)
+            self.connector.cursor.execute(query, params)
             results = self.connector.cursor.fetchall()
             
             papers = []
@@ -203,10 +221,11 @@ class CFPaperRecommender:
         """
         Fallback: return papers without scoring when project embedding is missing.
         """
-        papers = self._get_unrecommended_papers(project_id)
+        # Let MySQL order and cut the list instead of fetching every paper and slicing
+        papers = self._get_unrecommended_papers(project_id, limit=topk)
         
         result = []
-        for paper in papers[:topk]:
+        for paper in papers:
             paper_with_authors = self.db_select.get_paper_with_authors(paper['paper_id'])
             authors = []
             if paper_with_authors and paper_with_authors.get('authors'):
@@ -14,8 +14,12 @@ import random
 import time
 import pickle
 import os
+import re
 
 
+# "word_id:count" pairs in a mult.dat line (the leading token is the pair count)
+_WORD_COUNT_RE = re.compile(r"(\d+):(\d+)")
+
 model_directory = r"backend\src\cf_recommender\data-cite"
 models_directory = r"backend\src\cf_recommender\models"
 
@@ -154,18 +158,13 @@ class ContentBased:
 
         with open(mult_file, 'r') as f:
             for original_item_id, line in enumerate(f):
-                parts = line.strip().split()
-                if len(parts) < 1:
+                if not line or line.isspace():
                     continue
 
-                num_words = int(parts[0])
-                features = {}
-
-                for i in range(1, len(parts)):
-                    word_id, count = parts[i].split(':')
-                    features[int(word_id)] = int(count)
-
-                mult_features[original_item_id] = features
+                # Stream the pairs straight into the dict instead of splitting into token lists
+                mult_features[original_item_id] = {
+                    int(m.group(1)): int(m.group(2)) for m in _WORD_COUNT_RE.finditer(line)
+                }
 
         # Create feature matrix for our items
         max_word_id = max(
@@ -1,2 +1,8 @@
 GENERATE_SUBMISSION = "/api/generate_submission/"
-LIKE_DISLIKE = "/api/like_dislike/"
\ No newline at end of file
+GENERATE_SUBMISSION_STREAM = GENERATE_SUBMISSION + "stream/"
+GENERATE_SUBMISSION_PANEL = GENERATE_SUBMISSION + "individual_panel/"
+LIKE_DISLIKE = "/api/like_dislike/"
+LIKE_DISLIKE_UPDATE = LIKE_DISLIKE + "update/"
+YOUTUBE_BATCH = "/api/youtube/batch"
+PAPERS_BATCH = "/api/papers/batch"
+MAX_BATCH_IDS = 100
@@ -1,5 +1,47 @@
 import mysql.connector
+import mysql.connector.pooling
 import os
+import threading
+from functools import lru_cache
+
+# Connections kept open for reuse, overridable with DB_POOL_SIZE;
+# 32 is mysql-connector's upper limit for a pool
+POOL_SIZE = max(1, min(int(os.getenv('DB_POOL_SIZE', '20')), 32))
+_pool = None
+_pool_lock = threading.Lock()
+
+@lru_cache(maxsize=1)
+def _db_config():
+    """Connection settings, read from the environment once per process."""
+    return {
+        "user": os.getenv('USER'),
+        "password" : os.getenv('PASSWORD'),
+        "host": os.getenv('HOST'),
+        "port": os.getenv('PORT'),
+        "database": "memoscholar",
+        "raise_on_warnings": True
+    }
+
+def _get_pool():
+    """The process-wide connection pool, created on first use."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = mysql.connector.pooling.MySQLConnectionPool(
+                    pool_name="memoscholar", pool_size=POOL_SIZE, **_db_config()
+                )
+    return _pool
+
+def _connect():
+    """
+    Borrow a pooled connection; closing it hands it back to the pool.
+    When every pooled connection is checked out, open a standalone one rather than fail.
+    """
+    try:
+        return _get_pool().get_connection()
+    except mysql.connector.errors.PoolError:
+        return mysql.connector.connect(**_db_config())
 
 class Connector:
     def __init__(self):
@@ -12,15 +54,7 @@ class Connector:
             return None
             
         try:
-            config = {
-                "user": os.getenv('USER'),
-                "password" : os.getenv('PASSWORD'),
-                "host": os.getenv('HOST'),
-                "port": os.getenv('PORT'),
-                "database": "memoscholar",
-                "raise_on_warnings": True
-            }
-            self.cnx = mysql.connector.connect(**config)
+            self.cnx = _connect()
             self.cursor = self.cnx.cursor()
             print("CONNECTED TO MYSQL")
             return None
@@ -1,21 +1,17 @@
-import os
-import sys
-
-# Add the backend directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
-
-from src.db.connector import Connector
+from ..connector import Connector
 
 class DBChange:
     def __init__(self):
         self.connector = Connector()
+        self.manage_connection = True  # Set to False to skip opening/closing connections
     
     def update_like(self, liked_disliked_id):
         """
         Update an existing like/dislike record by toggling the isLiked status.
         Returns True if successful, False otherwise.
         """
-        self.connector.open_connection()
+        if self.manage_connection:
+            self.connector.open_connection()
         try:
             query = "UPDATE likes SET isLiked = NOT isLiked WHERE liked_disliked_id = %s"
             values = (liked_disliked_id,)
@@ -36,4 +32,5 @@ class DBChange:
             self.connector.cnx.rollback()
             return False
         finally:
-            self.connector.close_connection()
\ No newline at end of file
+            if self.manage_connection:
+                self.connector.close_connection()
\ No newline at end of file
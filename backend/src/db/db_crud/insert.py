@@ -1,11 +1,39 @@
-import os
-import sys
-import json
+import mysql.connector
+import orjson
 
-# Add the backend directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+from ..connector import Connector
 
-from src.db.connector import Connector
+def _embedding_to_str(embedding):
+    """Serialize an embedding to the JSON array text expected by STRING_TO_VECTOR."""
+    if isinstance(embedding, list):
+        return orjson.dumps(embedding, option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    if hasattr(embedding, '__iter__'):
+        return orjson.dumps(list(embedding), option=orjson.OPT_SERIALIZE_NUMPY).decode()
+    return str(embedding)
+
+# Rows per multi-row INSERT sent by _executemany_chunked. executemany packs every row into one
+# statement, so large batches must be split to stay under the server's max_allowed_packet;
+# each embedding row is ~30KB of text, feature rows are tiny.
+_EMBEDDING_ROWS_PER_STATEMENT = 200
+_FEATURE_ROWS_PER_STATEMENT = 5000
+
+def _executemany_chunked(cursor, query, values, rows_per_statement):
+    """Run executemany over values in slices, one multi-row statement per slice."""
+    for start in range(0, len(values), rows_per_statement):
+        cursor.executemany(query, values[start:start + rows_per_statement])
+
+# Like/dislike insert per target type. The existence check and the insert are one
+# statement: nothing is inserted (rowcount 0) when the target is not in the project.
+_INSERT_LIKE_STATEMENTS = {
+    target_type: (
+        "INSERT INTO likes (project_id, target_type, target_id, isLiked) "
+        f"SELECT %s, '{target_type}', %s, %s FROM {table} WHERE {id_column} = %s AND project_id = %s"
+    )
+    for target_type, table, id_column in (
+        ("youtube", "youtube", "youtube_id"),
+        ("paper", "papers", "paper_id"),
+    )
+}
 
 class DBInsert:
     def __init__(self):
@@ -30,6 +58,47 @@ class DBInsert:
             if self.manage_connection:
                 self.connector.close_connection()
 
+    def get_or_create_user(self, name, email):
+        """
+        Get the user with this email, creating it first if there is none.
+        Returns the user dict (user_id, name, email) or None if failed.
+        The existence check is part of the INSERT itself, so a new user costs one statement.
+        Two concurrent signups can both pass the check; the unique index on email then
+        rejects the second INSERT, which reads the first one's row instead.
+        """
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            cursor = self.connector.cursor
+            try:
+                cursor.execute(
+                    """
+                    INSERT INTO users (name, email)
+                    SELECT %s, %s FROM DUAL
+                    WHERE NOT EXISTS (SELECT 1 FROM users WHERE email = %s)
+                    """,
+                    (name, email, email)
+                )
+                inserted = cursor.rowcount == 1
+            except mysql.connector.IntegrityError:
+                # Lost the race to a concurrent signup for the same email
+                inserted = False
+            if inserted:
+                user = {'user_id': cursor.lastrowid, 'name': name, 'email': email}
+            else:
+                cursor.execute("SELECT user_id, name, email FROM users WHERE email = %s", (email,))
+                result = cursor.fetchone()
+                user = {'user_id': result[0], 'name': result[1], 'email': result[2]} if result else None
+            self.connector.cnx.commit()
+            return user
+        except Exception as e:
+            print("get_or_create_user error:", e)
+            self.connector.cnx.rollback()
+            return None
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+
     def create_project(self, user_id, topic, objective, guidelines):
         """Create project (embedding stored separately). user_id is REQUIRED by schema."""
         self.connector.open_connection()
@@ -48,6 +117,35 @@ class DBInsert:
             if self.manage_connection:
                 self.connector.close_connection()
 
+    def create_project_with_query(self, user_id, topic, objective, guidelines, queries_text):
+        """
+        Create a project and its first query in one transaction (one commit).
+        Returns (project_id, query_id), or (None, None) if either insert failed.
+        """
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            cursor = self.connector.cursor
+            cursor.execute(
+                "INSERT INTO project (user_id, topic, objective, guidelines) VALUES (%s, %s, %s, %s)",
+                (user_id, topic, objective, guidelines)
+            )
+            project_id = cursor.lastrowid
+            cursor.execute(
+                "INSERT INTO queries (project_id, queries_text) VALUES (%s, %s)",
+                (project_id, queries_text)
+            )
+            query_id = cursor.lastrowid
+            self.connector.cnx.commit()
+            return project_id, query_id
+        except Exception as e:
+            print("create_project_with_query error:", e)
+            self.connector.cnx.rollback()
+            return None, None
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+
     def create_project_embedding(self, project_id, embedding):
         """Insert embedding into project_embeddings for a project."""
         if self.manage_connection:
@@ -56,12 +154,7 @@ class DBInsert:
             # Convert embedding to JSON string if it's a list or array
             if embedding is None:
                 return None
-            if isinstance(embedding, list):
-                embedding_str = json.dumps(embedding)
-            elif hasattr(embedding, '__iter__'):
-                embedding_str = json.dumps(list(embedding))
-            else:
-                embedding_str = str(embedding)
+            embedding_str = _embedding_to_str(embedding)
 
             query = "INSERT INTO project_embeddings (project_id, embedding) VALUES (%s, STRING_TO_VECTOR(%s))"
             values = (project_id, embedding_str)
@@ -178,22 +271,95 @@ class DBInsert:
         """
         Create a paper and link it with its authors.
         Returns paper_id if successful, None if failed.
+        A one-paper batch of create_papers_with_authors, so authors are resolved and linked in bulk.
+        """
+        paper_ids = self.create_papers_with_authors(project_id, query_id, [{
+            'paper_title': paper_title,
+            'paper_summary': paper_summary,
+            'published_year': published_year,
+            'pdf_link': pdf_link,
+            'authors_list': authors_list
+        }])
+        return paper_ids[0] if paper_ids else None
+
+    def create_papers_with_authors(self, project_id, query_id, papers):
+        """
+        Create many papers and link them with their authors in one transaction.
+        papers is a list of dicts with paper_title, paper_summary, published_year, pdf_link and authors_list.
+        Returns the list of paper_ids in input order, or None if the batch failed.
         """
-        # First create the paper
-        paper_id = self.create_paper(project_id, query_id, paper_title, paper_summary, published_year, pdf_link)
-        
-        if paper_id is None:
+        if not papers:
+            return []
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            cursor = self.connector.cursor
+            # Papers are inserted one row at a time so each id comes straight from lastrowid;
+            # a multi-row INSERT's ids are not guaranteed to be contiguous. They still share
+            # the one transaction, and the author work below stays batched.
+            paper_ids = []
+            for paper in papers:
+                cursor.execute(
+                    """
+                    INSERT INTO papers (project_id, paper_title, paper_summary, published_year, pdf_link, query_id)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                    """,
+                    (project_id, paper['paper_title'], paper['paper_summary'], paper['published_year'],
+                     paper['pdf_link'], query_id)
+                )
+                paper_ids.append(cursor.lastrowid)
+
+            # Authors of the whole batch are resolved with one lookup and one insert
+            links = []
+            for paper_id, paper in zip(paper_ids, papers):
+                authors_list = paper.get('authors_list')
+                if authors_list and isinstance(authors_list, list):
+                    links.extend((paper_id, name.strip()) for name in authors_list if name and name.strip())
+            if links:
+                names = list(dict.fromkeys(name for _, name in links))
+                author_ids = self._get_author_ids(cursor, names)
+                missing = [name for name in names if self._lookup_author(author_ids, name) is None]
+                if missing:
+                    _executemany_chunked(cursor, "INSERT INTO authors (name) VALUES (%s)",
+                                         [(name,) for name in missing], _FEATURE_ROWS_PER_STATEMENT)
+                    author_ids.update(self._get_author_ids(cursor, missing))
+                link_rows = list(dict.fromkeys(
+                    (paper_id, self._lookup_author(author_ids, name)) for paper_id, name in links
+                ))
+                _executemany_chunked(cursor, "INSERT INTO paperauthors (paper_id, author_id) VALUES (%s, %s)",
+                                     link_rows, _FEATURE_ROWS_PER_STATEMENT)
+
+            self.connector.cnx.commit()
+            return paper_ids
+        except Exception as e:
+            print("create_papers_with_authors error:", e)
+            self.connector.cnx.rollback()
             return None
-        
-        # Then handle authors
-        if authors_list and isinstance(authors_list, list):
-            for author_name in authors_list:
-                if author_name and author_name.strip():
-                    author_id = self.get_or_create_author(author_name.strip())
-                    if author_id:
-                        self.add_paper_author(paper_id, author_id)
-        
-        return paper_id
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+
+    @staticmethod
+    def _get_author_ids(cursor, names):
+        """Map author name -> author_id (first by id) for the given names, also keyed lower-cased."""
+        author_ids = {}
+        for start in range(0, len(names), _FEATURE_ROWS_PER_STATEMENT):
+            chunk = names[start:start + _FEATURE_ROWS_PER_STATEMENT]
+            placeholders = ", ".join(["%s"] * len(chunk))
+            cursor.execute(
+                f"SELECT author_id, name FROM authors WHERE name IN ({placeholders}) ORDER BY author_id",
+                tuple(chunk)
+            )
+            for author_id, name in cursor.fetchall():
+                # name = %s compares case-insensitively, so keep a lower-cased key as well
+                author_ids.setdefault(name, author_id)
+                author_ids.setdefault(name.lower(), author_id)
+        return author_ids
+
+    @staticmethod
+    def _lookup_author(author_ids, name):
+        author_id = author_ids.get(name)
+        return author_id if author_id is not None else author_ids.get(name.lower())
 
     def create_youtube(self, project_id, query_id, video_title, video_description, video_duration, video_url,
                        video_views=0, video_likes=0):
@@ -226,12 +392,7 @@ class DBInsert:
         try:
             if embedding is None:
                 return None
-            if isinstance(embedding, list):
-                embedding_str = json.dumps(embedding)
-            elif hasattr(embedding, '__iter__'):
-                embedding_str = json.dumps(list(embedding))
-            else:
-                embedding_str = str(embedding)
+            embedding_str = _embedding_to_str(embedding)
 
             query = "INSERT INTO youtube_embeddings (project_id, embedding) VALUES (%s, STRING_TO_VECTOR(%s))"
             values = (project_id, embedding_str)
@@ -253,12 +414,7 @@ class DBInsert:
         try:
             if embedding is None:
                 return None
-            if isinstance(embedding, list):
-                embedding_str = json.dumps(embedding)
-            elif hasattr(embedding, '__iter__'):
-                embedding_str = json.dumps(list(embedding))
-            else:
-                embedding_str = str(embedding)
+            embedding_str = _embedding_to_str(embedding)
 
             query = """
                 INSERT INTO youtube_video_embeddings (youtube_id, embedding)
@@ -267,16 +423,53 @@ class DBInsert:
             """
             values = (youtube_id, embedding_str, embedding_str)
             self.connector.cursor.execute(query, values)
-            self.connector.cnx.commit()
+            if self.manage_connection:
+                self.connector.cnx.commit()
             return self.connector.cursor.lastrowid
         except Exception as e:
             print("upsert_youtube_video_embedding error:", e)
-            self.connector.cnx.rollback()
+            if self.manage_connection:
+                self.connector.cnx.rollback()
             return None
         finally:
             if self.manage_connection:
                 self.connector.close_connection()
 
+    def upsert_youtube_video_embeddings_bulk(self, embeddings_by_youtube_id):
+        """
+        Insert or update cached embeddings for many YouTube videos at once.
+        embeddings_by_youtube_id maps youtube_id -> embedding.
+        executemany rewrites the INSERT into multi-row statements of _EMBEDDING_ROWS_PER_STATEMENT rows.
+        """
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            values = [
+                (youtube_id, _embedding_to_str(embedding))
+                for youtube_id, embedding in embeddings_by_youtube_id.items()
+                if embedding is not None
+            ]
+            if not values:
+                return True
+
+            query = """
+                INSERT INTO youtube_video_embeddings (youtube_id, embedding)
+                VALUES (%s, STRING_TO_VECTOR(%s)) AS new
+                ON DUPLICATE KEY UPDATE embedding = new.embedding
+            """
+            _executemany_chunked(self.connector.cursor, query, values, _EMBEDDING_ROWS_PER_STATEMENT)
+            if self.manage_connection:
+                self.connector.cnx.commit()
+            return True
+        except Exception as e:
+            print("upsert_youtube_video_embeddings_bulk error:", e)
+            if self.manage_connection:
+                self.connector.cnx.rollback()
+            return False
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+
     def upsert_paper_embedding(self, paper_id, embedding):
         """Insert or update cached embedding for a paper."""
         if self.manage_connection:
@@ -284,12 +477,7 @@ class DBInsert:
         try:
             if embedding is None:
                 return None
-            if isinstance(embedding, list):
-                embedding_str = json.dumps(embedding)
-            elif hasattr(embedding, '__iter__'):
-                embedding_str = json.dumps(list(embedding))
-            else:
-                embedding_str = str(embedding)
+            embedding_str = _embedding_to_str(embedding)
 
             query = """
                 INSERT INTO paper_embeddings (paper_id, embedding)
@@ -308,6 +496,40 @@ class DBInsert:
             if self.manage_connection:
                 self.connector.close_connection()
 
+    def upsert_paper_embeddings_bulk(self, embeddings_by_paper_id):
+        """
+        Insert or update cached embeddings for many papers at once.
+        embeddings_by_paper_id maps paper_id -> embedding.
+        """
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            values = [
+                (paper_id, _embedding_to_str(embedding))
+                for paper_id, embedding in embeddings_by_paper_id.items()
+                if embedding is not None
+            ]
+            if not values:
+                return True
+
+            query = """
+                INSERT INTO paper_embeddings (paper_id, embedding)
+                VALUES (%s, STRING_TO_VECTOR(%s)) AS new
+                ON DUPLICATE KEY UPDATE embedding = new.embedding
+            """
+            _executemany_chunked(self.connector.cursor, query, values, _EMBEDDING_ROWS_PER_STATEMENT)
+            if self.manage_connection:
+                self.connector.cnx.commit()
+            return True
+        except Exception as e:
+            print("upsert_paper_embeddings_bulk error:", e)
+            if self.manage_connection:
+                self.connector.cnx.rollback()
+            return False
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+
     def insert_paper_features(self, paper_id, features_list):
         """Insert features for a paper."""
         if self.manage_connection:
@@ -344,26 +566,14 @@ class DBInsert:
         """
         self.connector.open_connection()
         try:
-            if target_type == "youtube":
-                # Check if it exists in the youtube table
-                chk = "SELECT 1 FROM youtube WHERE youtube_id = %s AND project_id = %s"
-                self.connector.cursor.execute(chk, (target_id, project_id))
-                
-                if self.connector.cursor.fetchone() is None:
-                    raise ValueError(f"youtube id {target_id} not found for project {project_id}")
-                        
-            elif target_type == "paper":
-                chk = "SELECT 1 FROM papers WHERE paper_id = %s AND project_id = %s"
-                self.connector.cursor.execute(chk, (target_id, project_id))
-                if self.connector.cursor.fetchone() is None:
-                    raise ValueError(f"{target_type} id {target_id} not found for project {project_id}")
-            else:
+            query = _INSERT_LIKE_STATEMENTS.get(target_type)
+            if query is None:
                 raise ValueError("target_type must be 'youtube' or 'paper'")
 
-            # Create the like/dislike record
-            query = "INSERT INTO likes (project_id, target_type, target_id, isLiked) VALUES (%s, %s, %s, %s)"
-            values = (project_id, target_type, target_id, isLiked)
-            self.connector.cursor.execute(query, values)
+            # Create the like/dislike record only if the target belongs to the project
+            self.connector.cursor.execute(query, (project_id, target_id, isLiked, target_id, project_id))
+            if self.connector.cursor.rowcount == 0:
+                raise ValueError(f"{target_type} id {target_id} not found for project {project_id}")
             self.connector.cnx.commit()
             # Return the like_id of the created like
             return self.connector.cursor.lastrowid
@@ -403,4 +613,60 @@ class DBInsert:
         finally:
             if self.manage_connection:
                 self.connector.close_connection()
-    
\ No newline at end of file
+
+    def insert_youtube_features_bulk(self, features_by_youtube_id):
+        """
+        Bring the stored features of many YouTube videos in line with features_by_youtube_id
+        (youtube_id -> list of (category, feature_value) tuples).
+        Reads the current rows once, then deletes the rows no longer produced and inserts
+        the missing ones; unchanged features are left as they are.
+        """
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            if not features_by_youtube_id:
+                return True
+
+            youtube_ids = list(features_by_youtube_id)
+            placeholders = ",".join(["%s"] * len(youtube_ids))
+            self.connector.cursor.execute(
+                f"SELECT youtube_id, category, feature FROM youtube_features WHERE youtube_id IN ({placeholders})",
+                youtube_ids
+            )
+            existing = set(self.connector.cursor.fetchall())
+            wanted = {
+                (youtube_id, cat, feat)
+                for youtube_id, features_list in features_by_youtube_id.items()
+                for cat, feat in features_list
+            }
+
+            # Delete features that are no longer produced
+            to_delete = list(existing - wanted)
+            if to_delete:
+                row_placeholders = ",".join(["(%s, %s, %s)"] * len(to_delete))
+                self.connector.cursor.execute(
+                    f"DELETE FROM youtube_features WHERE (youtube_id, category, feature) IN ({row_placeholders})",
+                    [value for row in to_delete for value in row]
+                )
+
+            # Insert new features; the diff already excludes existing rows, and INSERT IGNORE
+            # would not help since the connector raises on the warning it emits
+            to_insert = list(wanted - existing)
+            if to_insert:
+                _executemany_chunked(
+                    self.connector.cursor,
+                    "INSERT INTO youtube_features(youtube_id, category, feature) VALUES (%s, %s, %s)",
+                    to_insert,
+                    _FEATURE_ROWS_PER_STATEMENT
+                )
+            if self.manage_connection:
+                self.connector.cnx.commit()
+            return True
+        except Exception as e:
+            print("insert_youtube_features_bulk error:", e)
+            if self.manage_connection:
+                self.connector.cnx.rollback()
+            return False
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
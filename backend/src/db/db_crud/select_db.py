@@ -1,23 +1,29 @@
-import os
-import sys
 import array
 
-# Add the backend directory to the Python path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..', '..'))
+import orjson
 
-from src.db.connector import Connector
+from ..connector import Connector
 
 class DBSelect:
     def __init__(self):
         self.connector = Connector()
         self.manage_connection = True  # Set to False to skip opening/closing connections
+        # Set by get_complete_project_data so a failing per-entity getter fails the whole
+        # bundle instead of contributing an empty list
+        self._raise_errors = False
     
     def _convert_embedding(self, embedding):
-        """Convert embedding array to list for JSON serialization"""
+        """
+        Return an embedding as a packed float32 array, the precision VECTOR columns store.
+        Kept packed (4 bytes per dimension) instead of unpacked into a list of Python floats;
+        numpy and the insert helpers accept it as-is.
+        """
         if embedding is None:
             return None
-        if isinstance(embedding, (array.array, list)):
-            return list(embedding)
+        if isinstance(embedding, array.array) and embedding.typecode == 'f':
+            return embedding
+        if isinstance(embedding, (array.array, list, tuple)):
+            return array.array('f', embedding)
         return embedding
     
     def get_user(self, user_id):
@@ -115,7 +121,8 @@ class DBSelect:
     
     def get_project(self, project_id):
         """Get a single project by ID"""
-        self.connector.open_connection()
+        if self.manage_connection:
+            self.connector.open_connection()
         try:
             query = """
                 SELECT project_id, user_id, topic, objective, guidelines 
@@ -134,10 +141,13 @@ class DBSelect:
                 }
             return None
         except Exception as e:
+            if self._raise_errors:
+                raise
             print(f"get_project error: {e}")
             return None
         finally:
-            self.connector.close_connection()
+            if self.manage_connection:
+                self.connector.close_connection()
     
     def get_all_projects(self):
         """Get all projects"""
@@ -168,7 +178,8 @@ class DBSelect:
     
     def get_project_queries(self, project_id):
         """Get all queries for a project"""
-        self.connector.open_connection()
+        if self.manage_connection:
+            self.connector.open_connection()
         try:
             query = """
                 SELECT query_id, project_id, queries_text, special_instructions 
@@ -188,11 +199,34 @@ class DBSelect:
                 for row in results
             ]
         except Exception as e:
+            if self._raise_errors:
+                raise
             print(f"get_project_queries error: {e}")
             return []
         finally:
-            self.connector.close_connection()
+            if self.manage_connection:
+                self.connector.close_connection()
     
+    def get_project_query_texts(self, project_id):
+        """Get just the queries_text of every query for a project, oldest first"""
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            query = """
+                SELECT queries_text
+                FROM queries
+                WHERE project_id = %s
+                ORDER BY query_id
+            """
+            self.connector.cursor.execute(query, (project_id,))
+            return [row[0] for row in self.connector.cursor.fetchall()]
+        except Exception as e:
+            print(f"get_project_query_texts error: {e}")
+            return []
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+
     def get_query(self, query_id):
         """Get a single query by ID"""
         self.connector.open_connection()
@@ -220,7 +254,8 @@ class DBSelect:
     
     def get_project_papers(self, project_id):
         """Get all papers for a project"""
-        self.connector.open_connection()
+        if self.manage_connection:
+            self.connector.open_connection()
         try:
             query = """
                 SELECT paper_id, project_id, query_id, paper_title, paper_summary, 
@@ -247,7 +282,8 @@ class DBSelect:
             print(f"get_project_papers error: {e}")
             return []
         finally:
-            self.connector.close_connection()
+            if self.manage_connection:
+                self.connector.close_connection()
     
     def get_paper(self, paper_id):
         """Get a single paper by ID"""
@@ -278,6 +314,40 @@ class DBSelect:
         finally:
             self.connector.close_connection()
     
+    def get_papers(self, paper_ids):
+        """Get several papers by ID in one query, keyed by paper_id (missing IDs are left out)"""
+        if not paper_ids:
+            return {}
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            placeholders = ",".join(["%s"] * len(paper_ids))
+            query = f"""
+                SELECT paper_id, project_id, query_id, paper_title, paper_summary, 
+                       published_year, pdf_link 
+                FROM papers 
+                WHERE paper_id IN ({placeholders})
+            """
+            self.connector.cursor.execute(query, tuple(paper_ids))
+            return {
+                row[0]: {
+                    'paper_id': row[0],
+                    'project_id': row[1],
+                    'query_id': row[2],
+                    'paper_title': row[3],
+                    'paper_summary': row[4],
+                    'published_year': row[5],
+                    'pdf_link': row[6]
+                }
+                for row in self.connector.cursor.fetchall()
+            }
+        except Exception as e:
+            print(f"get_papers error: {e}")
+            return None
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+    
     def get_paper_with_authors(self, paper_id):
         """Get a paper with all its authors"""
         self.connector.open_connection()
@@ -364,6 +434,8 @@ class DBSelect:
                 for row in results
             ]
         except Exception as e:
+            if self._raise_errors:
+                raise
             print(f"get_project_youtube_videos error: {e}")
             return []
         finally:
@@ -436,6 +508,42 @@ class DBSelect:
         finally:
             self.connector.close_connection()
     
+    def get_youtube_videos(self, youtube_ids):
+        """Get several YouTube videos by ID in one query, keyed by youtube_id (missing IDs are left out)"""
+        if not youtube_ids:
+            return {}
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            placeholders = ",".join(["%s"] * len(youtube_ids))
+            query = f"""
+                SELECT youtube_id, project_id, query_id, video_title, video_description, 
+                       video_duration, video_url, video_views, video_likes
+                FROM youtube 
+                WHERE youtube_id IN ({placeholders})
+            """
+            self.connector.cursor.execute(query, tuple(youtube_ids))
+            return {
+                row[0]: {
+                    'youtube_id': row[0],
+                    'project_id': row[1],
+                    'query_id': row[2],
+                    'video_title': row[3],
+                    'video_description': row[4],
+                    'video_duration': str(row[5]) if row[5] else None,
+                    'video_url': row[6],
+                    'video_views': row[7],
+                    'video_likes': row[8]
+                }
+                for row in self.connector.cursor.fetchall()
+            }
+        except Exception as e:
+            print(f"get_youtube_videos error: {e}")
+            return None
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+    
     def get_author(self, author_id):
         """Get a single author by ID"""
         self.connector.open_connection()
@@ -477,7 +585,8 @@ class DBSelect:
     
     def get_likes_for_project(self, project_id):
         """Get all likes for a project"""
-        self.connector.open_connection()
+        if self.manage_connection:
+            self.connector.open_connection()
         try:
             query = """
                 SELECT liked_disliked_id, project_id, target_type, target_id, isLiked 
@@ -514,10 +623,13 @@ class DBSelect:
             
             return likes
         except Exception as e:
+            if self._raise_errors:
+                raise
             print(f"get_likes_for_project error: {e}")
             return []
         finally:
-            self.connector.close_connection()
+            if self.manage_connection:
+                self.connector.close_connection()
     
     def get_likes_for_item(self, project_id, target_type, target_id):
         """Get likes for a specific item (paper or youtube video)"""
@@ -548,7 +660,8 @@ class DBSelect:
     
     def get_like(self, liked_disliked_id):
         """Get a single like by ID"""
-        self.connector.open_connection()
+        if self.manage_connection:
+            self.connector.open_connection()
         try:
             query = """
                 SELECT liked_disliked_id, project_id, target_type, target_id, isLiked 
@@ -570,11 +683,17 @@ class DBSelect:
             print(f"get_like error: {e}")
             return None
         finally:
-            self.connector.close_connection()
+            if self.manage_connection:
+                self.connector.close_connection()
     
     def get_complete_project_data(self, project_id):
         """Get complete project data including all related entities"""
-        self.connector.open_connection()
+        if self.manage_connection:
+            self.connector.open_connection()
+        # The per-entity getters below run on this one connection instead of each
+        # opening (and closing) their own
+        manage_connection, self.manage_connection = self.manage_connection, False
+        self._raise_errors = True
         try:
             # Get project info
             project = self.get_project(project_id)
@@ -583,20 +702,14 @@ class DBSelect:
             
             # Get related data
             queries = self.get_project_queries(project_id)
-            papers = self.get_project_papers(project_id)
+            papers = self._get_project_papers_with_authors(project_id)
             youtube_videos = self.get_project_youtube_videos(project_id)
             likes = self.get_likes_for_project(project_id)
             
-            # Get authors for each paper
-            papers_with_authors = []
-            for paper in papers:
-                paper_with_authors = self.get_paper_with_authors(paper['paper_id'])
-                papers_with_authors.append(paper_with_authors)
-            
             return {
                 'project': project,
                 'queries': queries,
-                'papers': papers_with_authors,
+                'papers': papers,
                 'youtube_videos': youtube_videos,
                 'likes': likes
             }
@@ -604,9 +717,48 @@ class DBSelect:
             print(f"get_complete_project_data error: {e}")
             return None
         finally:
-            if self.manage_connection:
+            self.manage_connection = manage_connection
+            self._raise_errors = False
+            if manage_connection:
                 self.connector.close_connection()
 
+    def _get_project_papers_with_authors(self, project_id):
+        """
+        All papers for a project, each with its 'authors' list, in one query: the authors
+        are aggregated per paper as a JSON array rather than fetched in a second query.
+        Runs on the caller's open connection.
+        """
+        self.connector.cursor.execute(
+            """
+            SELECT p.paper_id, p.project_id, p.query_id, p.paper_title, p.paper_summary,
+                   p.published_year, p.pdf_link,
+                   JSON_ARRAYAGG(JSON_OBJECT('author_id', a.author_id, 'name', a.name))
+            FROM papers p
+            LEFT JOIN paperauthors pa ON pa.paper_id = p.paper_id
+            LEFT JOIN authors a ON a.author_id = pa.author_id
+            WHERE p.project_id = %s
+            GROUP BY p.paper_id
+            ORDER BY p.paper_id
+            """,
+            (project_id,)
+        )
+        papers = []
+        for row in self.connector.cursor.fetchall():
+            # A paper without authors aggregates to a single all-NULL object
+            authors = [author for author in orjson.loads(row[7]) if author['author_id'] is not None]
+            authors.sort(key=lambda author: author['name'].lower())
+            papers.append({
+                'paper_id': row[0],
+                'project_id': row[1],
+                'query_id': row[2],
+                'paper_title': row[3],
+                'paper_summary': row[4],
+                'published_year': row[5],
+                'pdf_link': row[6],
+                'authors': authors
+            })
+        return papers
+
     # ---------------- New embedding accessors ----------------
     def get_project_embedding(self, project_id):
         """Get the latest project embedding vector for a project from project_embeddings."""
@@ -692,6 +844,40 @@ class DBSelect:
             if self.manage_connection:
                 self.connector.close_connection()
 
+    def _get_embeddings_by_id(self, table, id_column, ids):
+        """Cached embeddings for several rows of an embeddings table in one query, keyed by id."""
+        if not ids:
+            return {}
+        if self.manage_connection:
+            self.connector.open_connection()
+        try:
+            placeholders = ",".join(["%s"] * len(ids))
+            query = f"""
+                SELECT {id_column}, embedding
+                FROM {table}
+                WHERE {id_column} IN ({placeholders})
+            """
+            self.connector.cursor.execute(query, tuple(ids))
+            return {
+                row[0]: self._convert_embedding(row[1])
+                for row in self.connector.cursor.fetchall()
+                if row[1] is not None
+            }
+        except Exception as e:
+            print(f"get {table} error: {e}")
+            return None
+        finally:
+            if self.manage_connection:
+                self.connector.close_connection()
+
+    def get_paper_embeddings(self, paper_ids):
+        """Get cached embeddings for several papers, keyed by paper_id (missing IDs are left out)"""
+        return self._get_embeddings_by_id("paper_embeddings", "paper_id", paper_ids)
+
+    def get_youtube_video_embeddings(self, youtube_ids):
+        """Get cached embeddings for several YouTube videos, keyed by youtube_id (missing IDs are left out)"""
+        return self._get_embeddings_by_id("youtube_video_embeddings", "youtube_id", youtube_ids)
+
     def get_youtube_features(self, youtube_id):
         """Get all features for a YouTube video"""
         self.connector.open_connection()
@@ -0,0 +1,26 @@
+-- Make users.email unique for databases created from an earlier tables.sql.
+-- get_or_create_user relies on the unique index: of two concurrent signups with the
+-- same email, the second INSERT fails with a duplicate-key error and reads the first row.
+
+-- Move projects of duplicate accounts to the oldest account with the same email
+UPDATE project p
+JOIN users u ON u.user_id = p.user_id
+JOIN (SELECT email, MIN(user_id) AS keep_id FROM users GROUP BY email) k ON k.email = u.email
+SET p.user_id = k.keep_id
+WHERE p.user_id <> k.keep_id;
+
+-- Remove the duplicate accounts themselves
+DELETE u FROM users u
+JOIN users keep ON keep.email = u.email AND keep.user_id < u.user_id;
+
+-- Replace the non-unique idx_users_email, if this database has it
+SET @drop_idx := (
+  SELECT IF(COUNT(*) > 0, 'ALTER TABLE users DROP INDEX idx_users_email', 'DO 0')
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE() AND table_name = 'users' AND index_name = 'idx_users_email'
+);
+PREPARE drop_idx FROM @drop_idx;
+EXECUTE drop_idx;
+DEALLOCATE PREPARE drop_idx;
+
+ALTER TABLE users ADD UNIQUE INDEX uq_users_email (email);
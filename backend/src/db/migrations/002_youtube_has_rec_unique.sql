@@ -0,0 +1,18 @@
+-- Make youtube_has_rec.youtube_id unique for databases created from an earlier tables.sql.
+-- _mark_topk_as_recommended marks videos with INSERT ... ON DUPLICATE KEY UPDATE, which
+-- only updates the existing row once this key exists; without it every re-mark adds a row.
+
+-- Keep one row per video (the oldest), recommended if any of its rows was
+UPDATE youtube_has_rec r
+JOIN (
+  SELECT youtube_id, MIN(youtube_has_rec_id) AS keep_id, MAX(hasBeenRecommended) AS recommended
+  FROM youtube_has_rec
+  GROUP BY youtube_id
+  HAVING COUNT(*) > 1
+) d ON d.keep_id = r.youtube_has_rec_id
+SET r.hasBeenRecommended = d.recommended;
+
+DELETE r FROM youtube_has_rec r
+JOIN youtube_has_rec keep ON keep.youtube_id = r.youtube_id AND keep.youtube_has_rec_id < r.youtube_has_rec_id;
+
+ALTER TABLE youtube_has_rec ADD UNIQUE KEY uq_youtube_has_rec_youtube (youtube_id);
@@ -0,0 +1,24 @@
+-- Make (youtube_id, category, feature) unique in youtube_features for databases created
+-- from an earlier tables.sql. insert_youtube_features_bulk writes only the difference
+-- between the stored and the computed features, which assumes no row is duplicated.
+
+-- Remove duplicate features, keeping the oldest row of each
+DELETE f FROM youtube_features f
+JOIN youtube_features keep
+  ON keep.youtube_id = f.youtube_id
+ AND keep.category = f.category
+ AND keep.feature = f.feature
+ AND keep.youtube_feature_id < f.youtube_feature_id;
+
+ALTER TABLE youtube_features ADD UNIQUE KEY uq_youtube_features_video (youtube_id, category, feature);
+
+-- The unique key replaces the non-unique covering index, if this database has it. It is
+-- dropped only now so the youtube_id foreign key always has an index to use.
+SET @drop_idx := (
+  SELECT IF(COUNT(*) > 0, 'ALTER TABLE youtube_features DROP INDEX idx_youtube_features_video', 'DO 0')
+  FROM information_schema.statistics
+  WHERE table_schema = DATABASE() AND table_name = 'youtube_features' AND index_name = 'idx_youtube_features_video'
+);
+PREPARE drop_idx FROM @drop_idx;
+EXECUTE drop_idx;
+DEALLOCATE PREPARE drop_idx;
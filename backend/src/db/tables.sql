@@ -19,7 +19,8 @@ DROP TABLE IF EXISTS users;
 CREATE TABLE users (
   user_id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
   name    TEXT NOT NULL,
-  email   VARCHAR(255) NOT NULL
+  email   VARCHAR(255) NOT NULL,
+  UNIQUE INDEX uq_users_email (email)
 ); 
 
 -- Projects
@@ -65,7 +66,9 @@ CREATE TABLE papers (
 -- Authors
 CREATE TABLE authors (
   author_id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
-  name      VARCHAR(255) NOT NULL
+  name      VARCHAR(255) NOT NULL,
+  -- get_or_create_author / create_paper_with_authors look authors up by name
+  INDEX idx_authors_name (name)
 );
 
 -- PaperAuthors (junction)
@@ -107,13 +110,16 @@ CREATE TABLE youtube (
   video_views       BIGINT DEFAULT 0,
   video_likes       BIGINT DEFAULT 0,
   FOREIGN KEY (project_id) REFERENCES project(project_id) ON DELETE CASCADE,
-  FOREIGN KEY (query_id)   REFERENCES queries(query_id)  ON DELETE SET NULL
+  FOREIGN KEY (query_id)   REFERENCES queries(query_id)  ON DELETE SET NULL,
+  -- add_candidates checks existing titles per project; also serves the project_id foreign key
+  INDEX idx_youtube_project_title (project_id, video_title)
 );
 
 CREATE TABLE youtube_has_rec (
 	youtube_has_rec_id BIGINT UNSIGNED AUTO_INCREMENT PRIMARY KEY,
     youtube_id BIGINT UNSIGNED NOT NULL,
     hasBeenRecommended BOOLEAN NOT NULL,
+    UNIQUE KEY uq_youtube_has_rec_youtube (youtube_id),
     FOREIGN KEY (youtube_id) REFERENCES youtube(youtube_id) ON DELETE CASCADE
 );
 
@@ -140,7 +146,10 @@ CREATE TABLE youtube_features (
     youtube_id         BIGINT UNSIGNED NOT NULL,
     category           ENUM('dur','fresh','pop','type','tok','kp','emb','engage') NOT NULL,
     feature            VARCHAR(64) NOT NULL,
-    FOREIGN KEY (youtube_id) REFERENCES youtube(youtube_id) ON DELETE CASCADE
+    FOREIGN KEY (youtube_id) REFERENCES youtube(youtube_id) ON DELETE CASCADE,
+    -- Covering index: feature lookups and the candidate JSON_ARRAYAGG join read (category, feature) by youtube_id.
+    -- Unique so a video never holds the same feature twice.
+    UNIQUE KEY uq_youtube_features_video (youtube_id, category, feature)
 );
 
 -- Likes
@@ -150,5 +159,7 @@ CREATE TABLE likes (
   target_type       VARCHAR(20) CHECK (target_type IN ('youtube', 'paper')),
   target_id         BIGINT UNSIGNED NOT NULL,
   isLiked           BOOLEAN NOT NULL,
-  FOREIGN KEY (project_id) REFERENCES project(project_id) ON DELETE CASCADE
+  FOREIGN KEY (project_id) REFERENCES project(project_id) ON DELETE CASCADE,
+  -- Covers the per-project liked/disliked id lookup used by the recommenders
+  INDEX idx_likes_project_target (project_id, target_type, isLiked, target_id)
 );
\ No newline at end of file
@@ -1,6 +1,4 @@
 import urllib.parse
-import urllib.request
-import json
 import xml.etree.ElementTree as ET
 from datetime import datetime
 from ..openai import openai_client
@@ -10,6 +8,11 @@ from ..db.db_crud.insert import DBInsert
 from ..db.connector import Connector
 from ..cf_recommender.cf_paper_recommender import CFPaperRecommender
 from .create_query import CreateQuery
+from ..utils.ttl_cache import TTLCache
+from ..utils.http_session import HTTP_SESSION
+
+# Raw arXiv responses by (query, max_results); repeated searches skip the upstream call
+_SEARCH_CACHE = TTLCache(maxsize=256, ttl=3600)
 
 class PaperGenerator:
     def __init__(self):
@@ -19,19 +22,27 @@ class PaperGenerator:
         self.logger = get_logger(__name__)
         self.db_select = DBSelect()
         self.db_insert = DBInsert()
-        self.create_query = CreateQuery()
+        self.create_query = CreateQuery(self.db_select)
         self.connector = Connector()
-        self.cf_paper_recommender = CFPaperRecommender(self.connector)
+        self.cf_paper_recommender = CFPaperRecommender(self.connector, self.db_select, self.db_insert)
 
     def search_paper(self, query: str, max_results: int = 10):
+        cache_key = (query, max_results)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            self.logger.info("arXiv search served from cache")
+            return cached
         encoded_query = urllib.parse.quote(query)
         self.url = (
             f"http://export.arxiv.org/api/query?"
             f"search_query={encoded_query}&start=0&max_results={max_results}"
         )
         try:
-            r = urllib.request.urlopen(self.url)
-            return r.read().decode('utf-8')
+            r = HTTP_SESSION.get(self.url)
+            r.raise_for_status()
+            content = r.content.decode('utf-8')
+            _SEARCH_CACHE.set(cache_key, content)
+            return content
         except Exception as e:
             return None
 
@@ -193,55 +204,42 @@ class PaperGenerator:
         # Map paper_id to original paper data for link and published date
         paper_id_to_raw_data = {}
         
-        for idx, paper in enumerate(raw_papers):
-            try:
-                # Extract paper information
-                paper_title = paper.get('title', 'No title')
-                paper_summary = paper.get('summary', '')
-                published_year = paper.get('published_year')
-                pdf_link = paper.get('pdf_link', '')
-                arxiv_link = paper.get('link', '')  # ArXiv abstract page link
-                published_date = paper.get('published', '')  # Full published date
-                authors_list = paper.get('authors', [])
-                
-                # If we don't have arxiv_link but have pdf_link, generate it
-                if not arxiv_link or arxiv_link == 'No link':
-                    if pdf_link and pdf_link != 'No PDF':
-                        # Convert PDF link to abstract link
-                        if '/pdf/' in pdf_link:
-                            arxiv_link = pdf_link.replace('/pdf/', '/abs/').replace('.pdf', '')
-                        else:
-                            arxiv_link = pdf_link
-                
-                # Skip if paper already exists (check by title)
-                # We'll add all papers for now, but you could add duplicate checking here
-                
-                # Create paper with authors in database
-                # Note: We store pdf_link in DB, and generate abstract link from it when needed
-                paper_id = self.db_insert.create_paper_with_authors(
-                    project_id=project_id,
-                    query_id=query_id,
-                    paper_title=paper_title,
-                    paper_summary=paper_summary,
-                    published_year=published_year,
-                    pdf_link=pdf_link,
-                    authors_list=authors_list
-                )
-                
-                if paper_id:
-                    added_paper_ids.append(paper_id)
-                    # Store original paper data for link and published date
-                    paper_id_to_raw_data[paper_id] = {
-                        'link': arxiv_link,
-                        'published': published_date
-                    }
-                    self.logger.info(f"Added paper {idx+1}/{len(raw_papers)}: {paper_title[:50]} (ID: {paper_id})")
-                else:
-                    self.logger.warning(f"Failed to add paper {idx+1}/{len(raw_papers)}: {paper_title[:50]}")
-                    
-            except Exception as e:
-                self.logger.error(f"Error adding paper {idx+1}/{len(raw_papers)}: {str(e)}", exc_info=True)
-                continue
+        paper_rows = []
+        raw_links = []
+        for paper in raw_papers:
+            pdf_link = paper.get('pdf_link', '')
+            arxiv_link = paper.get('link', '')  # ArXiv abstract page link
+            
+            # If we don't have arxiv_link but have pdf_link, generate it
+            if not arxiv_link or arxiv_link == 'No link':
+                if pdf_link and pdf_link != 'No PDF':
+                    # Convert PDF link to abstract link
+                    if '/pdf/' in pdf_link:
+                        arxiv_link = pdf_link.replace('/pdf/', '/abs/').replace('.pdf', '')
+                    else:
+                        arxiv_link = pdf_link
+            
+            # Note: We store pdf_link in DB, and generate abstract link from it when needed
+            paper_rows.append({
+                'paper_title': paper.get('title', 'No title'),
+                'paper_summary': paper.get('summary', ''),
+                'published_year': paper.get('published_year'),
+                'pdf_link': pdf_link,
+                'authors_list': paper.get('authors', [])
+            })
+            raw_links.append({
+                'link': arxiv_link,
+                'published': paper.get('published', '')  # Full published date
+            })
+        
+        # Create all papers with their authors in one transaction
+        paper_ids = self.db_insert.create_papers_with_authors(project_id, query_id, paper_rows)
+        if paper_ids is None:
+            self.logger.warning(f"Failed to add {len(paper_rows)} papers to database")
+        else:
+            added_paper_ids = paper_ids
+            # Store original paper data for link and published date
+            paper_id_to_raw_data = dict(zip(paper_ids, raw_links))
         
         self.logger.info(f"Successfully added {len(added_paper_ids)} papers to database")
 
@@ -298,8 +296,13 @@ class PaperGenerator:
                 # Format CF recommendations for response
                 formatted_papers = []
                 for rec in cf_recs:
-                    paper_id = rec.get('paper_id')
-                    pdf_link = rec.get('pdf_link', '')
+                    # Every recommendation carries these keys (see CFPaperRecommender.recommend)
+                    paper_id = rec['paper_id']
+                    pdf_link = rec['pdf_link']
+                    paper_title = rec['paper_title']
+                    paper_summary = rec['paper_summary']
+                    published_year = rec['published_year']
+                    calculated_score = rec['calculated_score']
                     
                     # Get original link and published date if available
                     raw_data = paper_id_to_raw_data.get(paper_id, {})
@@ -318,22 +321,22 @@ class PaperGenerator:
                     if published_date and published_date != 'No date':
                         published = published_date
                     else:
-                        published = f"{rec.get('published_year')}-01-01T00:00:00Z" if rec.get('published_year') else None
+                        published = f"{published_year}-01-01T00:00:00Z" if published_year else None
                     
                     formatted_papers.append({
                         'paper_id': paper_id,
-                        'title': rec.get('paper_title', ''),  # Frontend expects 'title'
-                        'paper_title': rec.get('paper_title', ''),
+                        'title': paper_title,  # Frontend expects 'title'
+                        'paper_title': paper_title,
                         'link': arxiv_link,  # ArXiv abstract page for clickable title
                         'pdf_link': pdf_link,
-                        'summary': rec.get('paper_summary', ''),  # Frontend expects 'summary'
-                        'paper_summary': rec.get('paper_summary', ''),
-                        'published_year': rec.get('published_year'),
+                        'summary': paper_summary,  # Frontend expects 'summary'
+                        'paper_summary': paper_summary,
+                        'published_year': published_year,
                         'published': published,
-                        'authors': rec.get('authors', []),
-                        'calculated_score': rec.get('calculated_score', 0.0)
+                        'authors': rec['authors'],
+                        'calculated_score': calculated_score
                     })
-                    self.logger.info(f"Recommended paper: {rec.get('paper_title', 'Unknown')[:50]} (score: {rec.get('calculated_score', 0):.4f})")
+                    self.logger.debug("Recommended paper: %s (score: %.4f)", paper_title[:50], calculated_score)
         
         except Exception as e:
             self.logger.error(f"Failed to get CF recommendations: {str(e)}", exc_info=True)
@@ -1,20 +1,31 @@
-import json
 import os
-import logging
+import orjson
 import requests
 import re
+from functools import lru_cache
 from ..openai import openai_client
-from ..utils.logging_config import get_logger
+from ..utils.logging_config import debug_enabled, get_logger
 from ..db.db_crud.select_db import DBSelect
 from ..db.db_crud.insert import DBInsert
 from .create_query import CreateQuery
 from ..jaccard_coefficient.jaccard_videos import JaccardVideoRecommender
 from ..db.connector import Connector
 from ..text_embedding.embedding import Embedding
+from ..utils.ttl_cache import TTLCache
+from ..utils.http_session import HTTP_SESSION
 
 YOUTUBE_SEARCH_URL = "https://www.googleapis.com/youtube/v3/search"
 YOUTUBE_VIDEOS_URL = "https://www.googleapis.com/youtube/v3/videos"
 
+@lru_cache(maxsize=1)
+def _youtube_api_key():
+    """YouTube Data API key, read from the environment once per process."""
+    return os.getenv("YOUTUBE_API_KEY")
+
+# Search results (with their embeddings) by (query, max_results); a repeated search skips the
+# two YouTube API calls and the per-video embedding calls
+_SEARCH_CACHE = TTLCache(maxsize=256, ttl=3600)
+
 class YoutubeGenerator:
     def __init__(self):
         self.cx = Connector()
@@ -23,7 +34,7 @@ class YoutubeGenerator:
         self.logger = get_logger(__name__)
         self.db_select = DBSelect()
         self.db_insert = DBInsert()
-        self.create_query = CreateQuery()
+        self.create_query = CreateQuery(self.db_select)
         self.jaccard_video_recommender = JaccardVideoRecommender(self.cx)
         self.embedding = Embedding()
     
@@ -93,19 +104,26 @@ class YoutubeGenerator:
             if video['video_title'] not in past_titles:
                 unique_videos.append(video)
             else:
-                self.logger.info(f"Skipping duplicate video: {video['video_title']}")
+                self.logger.debug("Skipping duplicate video: %s", video['video_title'])
         
         self.logger.info(f"Filtered {len(videos) - len(unique_videos)} duplicate videos, returning {len(unique_videos)} unique videos")
         return unique_videos
     
     def _search_youtube_videos(self, query: str, max_results: int = 10):
-        api_key = os.getenv("YOUTUBE_API_KEY")
+        cache_key = (query, max_results)
+        cached = _SEARCH_CACHE.get(cache_key)
+        if cached is not None:
+            self.logger.info("YouTube search served from cache")
+            # Callers annotate the video dicts, so hand out copies
+            return [dict(video) for video in cached]
+
+        api_key = _youtube_api_key()
         if not api_key:
             raise ValueError("Missing YOUTUBE_API_KEY")
 
         # Step 1: search to get video IDs
         try:
-            r = requests.get(YOUTUBE_SEARCH_URL, params={
+            r = HTTP_SESSION.get(YOUTUBE_SEARCH_URL, params={
                 "key": api_key,
                 "q": query,
                 "part": "snippet",
@@ -114,7 +132,7 @@ class YoutubeGenerator:
                 "safeSearch": "none"
             })
             r.raise_for_status()
-            items = r.json().get("items", [])
+            items = orjson.loads(r.content).get("items", [])
             
             video_ids = [it["id"]["videoId"] for it in items if "id" in it and "videoId" in it["id"]]
             
@@ -122,7 +140,7 @@ class YoutubeGenerator:
                 return []
 
             # Step 2: fetch details for those IDs
-            r2 = requests.get(YOUTUBE_VIDEOS_URL, params={
+            r2 = HTTP_SESSION.get(YOUTUBE_VIDEOS_URL, params={
                 "key": api_key,
                 "id": ",".join(video_ids),
                 "part": "snippet,contentDetails,statistics"
@@ -130,7 +148,7 @@ class YoutubeGenerator:
             r2.raise_for_status()
             
             results = []
-            for v in r2.json().get("items", []):
+            for v in orjson.loads(r2.content).get("items", []):
                 snippet = v.get("snippet", {})
                 stats = v.get("statistics", {})
                 content = v.get("contentDetails", {})
@@ -139,22 +157,21 @@ class YoutubeGenerator:
                 raw_duration = content.get("duration", "")
                 parsed_duration = self._parse_iso8601_duration(raw_duration)
                 
-                # Generate embedding for video
-                video_title = snippet.get("title", "")
-                video_description = snippet.get("description", "")
-                embedding_text = f"{video_title}; {video_description}"
-                video_embedding = self.embedding.embed_text(embedding_text)
-                
                 results.append({
-                    "video_title": video_title,
-                    "video_description": video_description,
+                    "video_title": snippet.get("title", ""),
+                    "video_description": snippet.get("description", ""),
                     "video_duration": parsed_duration,   # Now in HH:MM:SS format
                     "video_views": int(stats.get("viewCount", 0) or 0),
                     "video_likes": int(stats.get("likeCount", 0) or 0),
-                    "video_url": f"https://www.youtube.com/watch?v={v.get('id')}",
-                    "video_embedding": video_embedding
+                    "video_url": f"https://www.youtube.com/watch?v={v.get('id')}"
                 })
             
+            # Generate an embedding per video, all in one batched request
+            embedding_texts = [f"{video['video_title']}; {video['video_description']}" for video in results]
+            for video, video_embedding in zip(results, self.embedding.embed_texts(embedding_texts)):
+                video["video_embedding"] = video_embedding
+            
+            _SEARCH_CACHE.set(cache_key, [dict(video) for video in results])
             return results
             
         except requests.RequestException as e:
@@ -190,7 +207,9 @@ class YoutubeGenerator:
                     'duration_time': video['video_duration'],
                     'url': video['video_url'],
                     'views': video['video_views'],
-                    'likes': video['video_likes']
+                    'likes': video['video_likes'],
+                    # Already computed by the search; stored with the new row instead of re-embedded
+                    'embedding': video.get('video_embedding')
                 })
             
             # Add candidates to youtube table
@@ -208,17 +227,16 @@ class YoutubeGenerator:
         jaccard_recs = self.jaccard_video_recommender.recommend(data['project_id'], topk=5, include_likes=True)
 
         # jaccard_recs now returns full video details with score
-        formatted_recs = []
-        for rec in jaccard_recs:
-            # Log without problematic characters to avoid UnicodeEncodeError
-            safe_rec = {
-                'youtube_id': rec.get('youtube_id'),
-                'video_title': self._safe_encode_string(rec.get('video_title', '')),
-                'score': rec.get('calculated_score')
-            }
-            self.logger.info(f"Jaccard rec: {safe_rec}")
-            # rec is already a dictionary with full video details and score
-            formatted_recs.append(rec)
+        formatted_recs = list(jaccard_recs)
+        if debug_enabled(self.logger):
+            for rec in formatted_recs:
+                # Log without problematic characters to avoid UnicodeEncodeError
+                safe_rec = {
+                    'youtube_id': rec.get('youtube_id'),
+                    'video_title': self._safe_encode_string(rec.get('video_title', '')),
+                    'score': rec.get('calculated_score')
+                }
+                self.logger.debug("Jaccard rec: %s", safe_rec)
         
         # Log summary without full content to avoid encoding issues
         self.logger.info(f"Returning {len(formatted_recs)} YouTube recommendations")
@@ -1,15 +1,44 @@
 from typing import Optional, List
 from datetime import datetime, timezone
+from bisect import bisect_left, bisect_right
 import re
 
+# Author-name normalization pattern, compiled once at import
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+
+# Bucket thresholds and labels, looked up with one bisect instead of an if-chain.
+# Duration: upper bounds are inclusive
+_DUR_THRESHOLDS = (3 * 60, 10 * 60, 20 * 60, 45 * 60)
+_DUR_BUCKETS = (
+    "dur:xs",   # 0-3 min (quick clips)
+    "dur:s",    # 3-10 min (short)
+    "dur:m",    # 10-20 min (medium)
+    "dur:l",    # 20-45 min (long)
+    "dur:xl",   # 45+ min (very long)
+)
+# Popularity: lower bounds are inclusive
+_POP_THRESHOLDS = (10_000, 100_000, 1_000_000, 10_000_000)
+_POP_BUCKETS = (
+    "pop:niche",  # < 10K (niche)
+    "pop:low",    # 10K-100K
+    "pop:mid",    # 100K-1M
+    "pop:high",   # 1M-10M
+    "pop:viral",  # ≥ 10M (viral)
+)
+# Semantic similarity: lower bounds are exclusive
+_SEM_THRESHOLDS = (0.50, 0.70, 0.85, 0.95)
+_SEM_BUCKETS = (
+    "sem:poor",       # <0.50 (weakly relevant)
+    "sem:low",        # 0.50-0.70 (somewhat relevant)
+    "sem:mid",        # 0.70-0.85 (relevant)
+    "sem:high",       # 0.85-0.95 (very relevant)
+    "sem:excellent",  # 0.95-1.0 (highly relevant)
+)
+
 def _dur_bucket(seconds: Optional[int]) -> Optional[str]:
     """Bucket duration into more granular categories"""
     if seconds is None: return None
-    if seconds <= 3 * 60:     return "dur:xs"  # 0-3 min (quick clips)
-    if seconds <= 10 * 60:    return "dur:s"   # 3-10 min (short)
-    if seconds <= 20 * 60:    return "dur:m"   # 10-20 min (medium)
-    if seconds <= 45 * 60:    return "dur:l"   # 20-45 min (long)
-    return "dur:xl"                            # 45+ min (very long)
+    return _DUR_BUCKETS[bisect_left(_DUR_THRESHOLDS, seconds)]
 
 def _fresh_bucket(published_at: Optional[datetime]) -> Optional[str]:
     """Bucket freshness based on days since published"""
@@ -29,11 +58,7 @@ def _fresh_bucket(published_at: Optional[datetime]) -> Optional[str]:
 def _pop_bucket(views: Optional[int]) -> Optional[str]:
     """Bucket popularity based on view count with more granularity"""
     if views is None: return None
-    if views >= 10_000_000: return "pop:viral"  # ≥ 10M (viral)
-    if views >= 1_000_000:  return "pop:high"   # 1M-10M
-    if views >= 100_000:    return "pop:mid"    # 100K-1M
-    if views >= 10_000:     return "pop:low"    # 10K-100K
-    return "pop:niche"                          # < 10K (niche)
+    return _POP_BUCKETS[bisect_right(_POP_THRESHOLDS, views)]
 
 class Features:
     """
@@ -59,11 +84,7 @@ class Features:
     def sem_bucket(score: Optional[float]) -> Optional[str]:
         """Bucket semantic similarity score with finer granularity"""
         if score is None: return None
-        if score > 0.95:        return "sem:excellent"  # 0.95-1.0 (highly relevant)
-        if score > 0.85:        return "sem:high"       # 0.85-0.95 (very relevant)
-        if score > 0.70:        return "sem:mid"        # 0.70-0.85 (relevant)
-        if score > 0.50:        return "sem:low"        # 0.50-0.70 (somewhat relevant)
-        return "sem:poor"                               # <0.50 (weakly relevant)
+        return _SEM_BUCKETS[bisect_left(_SEM_THRESHOLDS, score)]
     
     @staticmethod
     def video_features(
@@ -167,11 +188,9 @@ class Features:
     def normalize_author(name: str) -> Optional[str]:
         """Normalize author name for feature matching"""
         if not name: return None
-        # Remove special characters, lowercase, replace spaces with underscores
-        name = name.strip().lower()
-        name = re.sub(r"[^a-z0-9\s]", "", name)
-        name = re.sub(r"\s+", "_", name)
-        name = name.strip("_")
+        # Remove special characters, lowercase, replace spaces with underscores.
+        # One regex pass; split/join collapses and trims whitespace in the same step.
+        name = "_".join(_NON_ALNUM_RE.sub("", name.lower()).split())
         return name if name else None
 
     @staticmethod
@@ -1,15 +1,51 @@
 # src/jaccard_coefficient/jaccard_videos.py
+from collections import OrderedDict
 from dataclasses import dataclass
-from typing import List, Dict, Set, Optional, Tuple
-import logging
+from operator import itemgetter
+import heapq
+from typing import List, Dict, Set, FrozenSet, Optional, Tuple
+import sys
+
+import numpy as np
+import orjson
 
 from src.db.connector import Connector
 from src.db.db_crud.select_db import DBSelect
 from src.db.db_crud.insert import DBInsert
 from src.text_embedding.embedding import Embedding
 from src.jaccard_coefficient.features import Features
+from src.utils.logging_config import debug_enabled, get_logger
+
+logger = get_logger(__name__)
+
+# Liked and disliked youtube ids for a project in one round trip
+_PROJECT_VIDEO_LIKES_SQL = """
+    SELECT target_id, isLiked
+    FROM likes
+    WHERE project_id = %s AND target_type = 'youtube'
+"""
+
+# Rows per page when refreshing features over the youtube table
+_REFRESH_BATCH_SIZE = 5000
 
-logger = logging.getLogger(__name__)
+# Max youtube_ids kept in the per-recommender feature cache
+_FEATURE_CACHE_SIZE = 4096
+
+# Max liked/disliked profile combinations kept per recommender
+_PROFILE_CACHE_SIZE = 64
+
+def _popcount(bits: np.ndarray) -> np.ndarray:
+    """Count set bits along the last axis of a packed uint64 bitset array."""
+    if hasattr(np, "bitwise_count"):
+        # NumPy >= 2.0: hardware popcount per 64-bit word, no 8x unpacked temporary
+        return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+    return np.unpackbits(bits.view(np.uint8), axis=-1).sum(axis=-1)
+
+def _bitset_jaccard(profile_bits: np.ndarray, profile_len: int, cand_bits: np.ndarray, cand_lens: np.ndarray) -> np.ndarray:
+    """Jaccard of one profile bitset (W,) against every candidate bitset row (N, W) with known set sizes."""
+    inter = _popcount(np.bitwise_and(cand_bits, profile_bits))
+    union = profile_len + cand_lens - inter
+    return np.divide(inter, union, out=np.zeros(len(cand_bits)), where=union > 0)
 
 @dataclass
 class ScoredItem:
@@ -89,30 +125,66 @@ class JaccardVideoRecommender:
         self.db_select.manage_connection = False
         self.db_insert.manage_connection = False
 
+        # Frozen views of WEIGHTS for the scoring loops
+        self._weights_items = tuple(self.WEIGHTS.items())
+        self._cats = tuple(self.WEIGHTS.keys())
+
+        # LRU cache of youtube_id -> category -> frozenset of features; cleared whenever
+        # this recommender rewrites youtube_features
+        self._features_cache: "OrderedDict[int, Dict[str, FrozenSet[str]]]" = OrderedDict()
+
+        # LRU cache of (liked ids, disliked ids, include_likes) -> frozen profiles from _load_profiles
+        self._profile_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+        # (category, feature) -> small integer id, kept across calls so bitsets are built from
+        # integer indices instead of per-call string lookups; _feature_id_cats[id] is the index
+        # of that id's category in self._cats
+        self._feature_ids: Dict[Tuple[str, str], int] = {}
+        self._feature_id_cats: List[int] = []
+
     def _ensure_connection(self) -> None:
         if self.cx.cursor is None or self.cx.cnx is None or not self.cx.cnx.is_connected():
             self.cx.open_connection()
 
-    def weighted_jaccard(self, features_A: Dict[str, Set[str]], features_B: Dict[str, Set[str]]) -> float:
+    def _empty_feat_template(self) -> Dict[str, Set[str]]:
+        """Fresh category -> empty set mapping for accumulating features."""
+        return {c: set() for c in self._cats}
+
+    def _freeze_features(self, features: Dict[str, Set[str]]) -> Tuple[Dict[str, FrozenSet[str]], Dict[str, int]]:
+        """Freeze a profile's per-category sets and precompute their sizes for repeated scoring."""
+        frozen = {cat: frozenset(feats) for cat, feats in features.items()}
+        return frozen, {cat: len(feats) for cat, feats in frozen.items()}
+
+    def weighted_jaccard(
+        self,
+        features_A: Dict[str, Set[str]],
+        features_B: Dict[str, Set[str]],
+        lens_A: Optional[Dict[str, int]] = None
+    ) -> float:
         """
         Calculate weighted jaccard coefficient across feature categories.
         
         Args:
             features_A: Dict mapping category -> Set of feature values
             features_B: Dict mapping category -> Set of feature values
+            lens_A: Optional precomputed category -> len(features_A[category])
         
         Returns:
             Weighted jaccard score
         """
         total_score = 0.0
         
-        for category, weight in self.WEIGHTS.items():
+        for category, weight in self._weights_items:
             A_cat = features_A.get(category, set())
             B_cat = features_B.get(category, set())
+            len_A = lens_A.get(category, 0) if lens_A is not None else len(A_cat)
+            len_B = len(B_cat)
             
-            # Jaccard for this category
-            intersection = len(A_cat & B_cat)
-            union = len(A_cat | B_cat)
+            # Jaccard for this category; count the overlap by probing the larger set
+            # with the smaller one so neither the intersection nor the union is built
+            small, big = (A_cat, B_cat) if len_A <= len_B else (B_cat, A_cat)
+            intersection = sum(1 for x in small if x in big)
+            union = len_A + len_B - intersection
             
             if union > 0:
                 jaccard = intersection / union
@@ -120,6 +192,82 @@ class JaccardVideoRecommender:
         
         return total_score
 
+    def _feature_id_array(self, feats: Dict[str, Set[str]]) -> np.ndarray:
+        """
+        Compact int32 ids for all of an item's features, interning unseen (category, feature)
+        pairs into the shared vocabulary and recording each new id's category index.
+        """
+        ids = self._feature_ids
+        id_cats = self._feature_id_cats
+        out = []
+        for cat_idx, category in enumerate(self._cats):
+            for feature in feats.get(category, ()):
+                key = (category, feature)
+                fid = ids.get(key)
+                if fid is None:
+                    fid = ids[key] = len(ids)
+                    id_cats.append(cat_idx)
+                out.append(fid)
+        return np.array(out, dtype=np.int32)
+
+    def _pack_bitsets(self, rows: List[np.ndarray], nbits: int) -> np.ndarray:
+        """Pack rows of feature ids into (len(rows), nbits // 64) uint64 bitsets with one scatter."""
+        lens = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+        dense = np.zeros((len(rows), nbits), dtype=np.uint8)
+        if lens.any():
+            dense[np.repeat(np.arange(len(rows)), lens), np.concatenate(rows)] = 1
+        return np.packbits(dense, axis=1).view(np.uint64)
+
+    def _weighted_jaccard_all(
+        self,
+        proj_feats: Dict[str, FrozenSet[str]],
+        proj_lens: Dict[str, int],
+        disliked_feats: Optional[Dict[str, FrozenSet[str]]],
+        disliked_lens: Optional[Dict[str, int]],
+        cand_feats_list: List[Dict[str, Set[str]]]
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Vectorized weighted_jaccard of the positive and negative profiles against all candidates.
+
+        Every item is encoded once over the shared (category, feature) vocabulary; each
+        category is then scored by masking the packed bitsets, so the per-category work is
+        pure NumPy and the Python-level cost is one encode per item.
+
+        Returns:
+            (J^+ scores, J^- scores), each of shape (N,)
+        """
+        proj_ids = self._feature_id_array(proj_feats)
+        disliked_ids = self._feature_id_array(disliked_feats) if disliked_feats else None
+        cand_ids = [self._feature_id_array(feats) for feats in cand_feats_list]
+
+        nbits = max(1, (len(self._feature_ids) + 63) // 64) * 64
+        project_bits = self._pack_bitsets([proj_ids], nbits)[0]
+        disliked_bits = self._pack_bitsets([disliked_ids], nbits)[0] if disliked_ids is not None else None
+        cand_bits = self._pack_bitsets(cand_ids, nbits)
+
+        # Row c of cat_masks has the bits of every vocabulary id belonging to category c
+        id_cats = np.zeros(nbits, dtype=np.int64)
+        id_cats[:len(self._feature_id_cats)] = self._feature_id_cats
+        id_cats[len(self._feature_id_cats):] = -1
+        cat_masks = self._pack_bitsets(
+            [np.flatnonzero(id_cats == cat_idx) for cat_idx in range(len(self._cats))], nbits
+        )
+
+        pos = np.zeros(len(cand_feats_list))
+        neg = np.zeros(len(cand_feats_list))
+        for cat_idx, (category, weight) in enumerate(self._weights_items):
+            mask = cat_masks[cat_idx]
+            cat_cand_bits = np.bitwise_and(cand_bits, mask)
+            cand_lens = _popcount(cat_cand_bits)
+            pos += weight * _bitset_jaccard(
+                np.bitwise_and(project_bits, mask), proj_lens.get(category, 0), cat_cand_bits, cand_lens
+            )
+            if disliked_bits is not None:
+                neg += weight * _bitset_jaccard(
+                    np.bitwise_and(disliked_bits, mask), disliked_lens.get(category, 0), cat_cand_bits, cand_lens
+                )
+        return pos, neg
+
     def update_features(self, project_id: Optional[int] = None) -> None:
         """
         Refresh derived features for persisted YouTube videos.
@@ -143,55 +291,77 @@ class JaccardVideoRecommender:
             List of top-k recommended videos with scores
         """
         self._ensure_connection()
+        # The connection is checked once here; helpers below reuse this cursor directly
+        cur = self.cx.cursor
         logger.info(f"Starting recommendation for project_id={project_id}, topk={topk}, include_likes={include_likes}")
 
-        # Load project features (liked items + project text)
-        proj_features = self._load_project_features(project_id, include_likes=include_likes)
-        logger.info(f"Loaded project features: {[(cat, len(feats)) for cat, feats in proj_features.items()]}")
+        liked_ids, disliked_ids = self._load_like_ids(cur, project_id)
 
-        # Load disliked features
-        disliked_features = self._load_disliked_features(project_id)
+        # Load project (liked items) and disliked profiles, reused while likes and features are unchanged
+        proj_features, proj_lens, disliked_features, disliked_lens = self._load_profiles(
+            liked_ids, disliked_ids, include_likes
+        )
+        logger.info(f"Loaded project features: {[(cat, len(feats)) for cat, feats in proj_features.items()]}")
         if disliked_features:
             logger.info(f"Loaded disliked features: {[(cat, len(feats)) for cat, feats in disliked_features.items()]}")
 
         # Fetch candidate videos (videos that haven't been recommended)
-        cand_rows = self._fetch_unrecommended_videos(project_id)
+        cand_rows = self._fetch_unrecommended_videos(cur, project_id)
         logger.info(f"Found {len(cand_rows)} unrecommended candidate videos")
 
-        scored: List[Tuple[int, str, Optional[str], float]] = []
-        for idx, r in enumerate(cand_rows):
-            # Extract features from candidate row
-            cand_features = self._extract_features_from_youtube_row(r)
-
-            # Debug: log features for first few videos
-            if idx < 3:
-                logger.info(f"Video {idx+1} '{r[1][:50]}' features: {[(cat, list(feats)) for cat, feats in cand_features.items()]}")
-
-            # Calculate J^+ (positive jaccard)
-            pos_score = self.weighted_jaccard(proj_features, cand_features)
-
-            # Calculate J^- (negative jaccard)
-            neg_score = self.weighted_jaccard(disliked_features, cand_features) if disliked_features else 0.0
-
-            # Calculate final score: S(P, i) = J^+(P, i) - λ * J^-(P, i)
-            final_score = max(0.0, pos_score - lambda_dislike * neg_score)
-
-            if idx < 3:
-                logger.info(f"Video {idx+1} scores: pos={pos_score:.4f}, neg={neg_score:.4f}, final={final_score:.4f}")
-
-            # r[0] = youtube_id, r[1] = video_title, r[4] = video_url
-            scored.append((r[0], r[1], r[4], final_score))
-
-        # Sort by score
-        scored_sorted = sorted(scored, key=lambda x: x[3], reverse=True)
-        logger.info(f"Top 5 scores: {[f'{s[1][:30]}={s[3]:.4f}' for s in scored_sorted[:5]]}")
+        # Extract features from candidate rows
+        cand_features_list = [self._extract_features_from_youtube_row(r) for r in cand_rows]
+
+        # Candidates inserted without features (e.g. before any update_features run) get them
+        # computed and persisted once here, so later calls read them straight from the join
+        missing = [idx for idx, feats in enumerate(cand_features_list) if not any(feats.values())]
+        if missing:
+            computed = self._refresh_features_batch([
+                (cand_rows[idx][0], project_id, cand_rows[idx][1], cand_rows[idx][2],
+                 cand_rows[idx][3], cand_rows[idx][5], cand_rows[idx][6])
+                for idx in missing
+            ])
+            for idx in missing:
+                feats = self._empty_feat_template()
+                for category, feature_value in computed.get(cand_rows[idx][0], ()):
+                    feats[category].add(sys.intern(feature_value))
+                cand_features_list[idx] = feats
+            logger.info(f"Computed and stored features for {len(missing)} candidates without features")
+
+        # Debug: log features for first few videos
+        if debug_enabled(logger):
+            for idx, (r, cand_features) in enumerate(zip(cand_rows[:3], cand_features_list)):
+                logger.debug("Video %d '%s' features: %s", idx + 1, r[1][:50],
+                             [(cat, list(feats)) for cat, feats in cand_features.items()])
+
+        # Calculate J^+ (positive jaccard) and J^- (negative jaccard) for all candidates at once
+        pos_scores, neg_scores = self._weighted_jaccard_all(
+            proj_features, proj_lens, disliked_features, disliked_lens, cand_features_list
+        )
+
+        # Calculate final score: S(P, i) = J^+(P, i) - λ * J^-(P, i)
+        final_scores = np.maximum(0.0, pos_scores - lambda_dislike * neg_scores)
+
+        if debug_enabled(logger):
+            for idx in range(min(3, len(cand_rows))):
+                logger.debug("Video %d scores: pos=%.4f, neg=%.4f, final=%.4f",
+                             idx + 1, pos_scores[idx], neg_scores[idx], final_scores[idx])
+
+        # r[0] = youtube_id, r[1] = video_title, r[4] = video_url
+        scored: List[Tuple[int, str, Optional[str], float]] = [
+            (r[0], r[1], r[4], float(s)) for r, s in zip(cand_rows, final_scores)
+        ]
+
+        # Select by score; only the top-k are persisted and returned, so select them in O(N log k)
+        top_scored = heapq.nlargest(topk, scored, key=itemgetter(3))
+        logger.info(f"Top 5 scores: {[f'{s[1][:30]}={s[3]:.4f}' for s in top_scored[:5]]}")
 
         # Mark top-k as recommended
-        self._mark_topk_as_recommended(project_id, scored_sorted[:topk])
+        self._mark_topk_as_recommended(cur, project_id, top_scored)
 
         # Return full YouTube video details with score
         result: List[Dict] = []
-        for youtube_id, title, url, s in scored_sorted[:topk]:
+        for youtube_id, title, url, s in top_scored:
             video_details = self.db_select.get_youtube_video(youtube_id)
             if video_details:
                 video_details['calculated_score'] = s
@@ -217,65 +387,108 @@ class JaccardVideoRecommender:
             s = secs % 60
             return f"{h:02d}:{m:02d}:{s:02d}"
 
-        added_ids = []
-        for idx, c in enumerate(candidates):
-            logger.info(f"Processing candidate {idx+1}/{len(candidates)}: {c.get('title', 'Unknown')[:50]}")
+        # Normalize candidates up front; the first candidate wins for duplicate titles
+        pending: Dict[str, Tuple] = {}
+        # Embeddings the caller already computed (e.g. during the YouTube search), by title
+        known_embeddings: Dict[str, List[float]] = {}
+        for c in candidates:
             title = c.get("title")
-            if not title:
+            if not title or title in pending:
                 continue
-            desc = c.get("description", "")
-            url = c.get("url")
-            views = int(c.get("views", 0) or 0)
-            likes = int(c.get("likes", 0) or 0)
-            
+            if c.get("embedding") is not None:
+                known_embeddings[title] = c["embedding"]
             if "duration_time" in c and c.get("duration_time") is not None:
                 dur_time = c.get("duration_time")
             else:
                 dur_time = _secs_to_time(c.get("duration_seconds"))
-            
-            # Check if video already exists
-            cur.execute("""
-                SELECT youtube_id FROM youtube 
-                WHERE project_id=%s AND video_title=%s
-            """, (project_id, title))
-            
-            if cur.fetchone():
-                continue  # Skip if already exists
-            
-            # Insert video
-            cur.execute(
-                """
-                INSERT INTO youtube(project_id, video_title, video_description, video_duration, video_url, video_views, video_likes)
-                VALUES (%s, %s, %s, %s, %s, %s, %s)
-                """,
-                (project_id, title, desc, dur_time, url, views, likes)
+            pending[title] = (
+                project_id,
+                title,
+                c.get("description", ""),
+                dur_time,
+                c.get("url"),
+                int(c.get("views", 0) or 0),
+                int(c.get("likes", 0) or 0),
             )
-            youtube_id = cur.lastrowid
-            added_ids.append(youtube_id)
-            
-            # Generate and insert features
-            duration_sec = None
-            if dur_time:
-                parts = dur_time.split(':')
-                duration_sec = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
-
-            # CRITICAL: Compute actual semantic similarity
-            sem_score = self._compute_semantic_similarity(project_id, youtube_id, title, desc)
 
-            features_list = self.features.video_features(
-                seconds=duration_sec,
-                published_at=None,
-                views=views,
-                sem_score=sem_score,
-                likes=likes
-            )
+        added_ids = []
+        features_by_youtube_id: Dict[int, List[tuple]] = {}
+        # All inserts (videos, embeddings, features) land in one transaction, committed once
+        try:
+            if pending:
+                # Skip videos that already exist, with one lookup for the whole batch
+                titles = list(pending)
+                placeholders = ",".join(["%s"] * len(titles))
+                cur.execute(
+                    f"SELECT video_title FROM youtube WHERE project_id=%s AND video_title IN ({placeholders})",
+                    [project_id, *titles]
+                )
+                for (existing_title,) in cur.fetchall():
+                    pending.pop(existing_title, None)
+
+            if pending:
+                # Insert videos as one multi-row INSERT, then read back their ids
+                cur.executemany(
+                    """
+                    INSERT INTO youtube(project_id, video_title, video_description, video_duration, video_url, video_views, video_likes)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s)
+                    """,
+                    list(pending.values())
+                )
+                titles = list(pending)
+                placeholders = ",".join(["%s"] * len(titles))
+                cur.execute(
+                    f"SELECT youtube_id, video_title FROM youtube WHERE project_id=%s AND video_title IN ({placeholders})",
+                    [project_id, *titles]
+                )
+                id_by_title = {title: youtube_id for youtube_id, title in cur.fetchall()}
+
+                # row format expected by _prefetch_video_embeddings: (youtube_id, project_id, title, desc)
+                rows = [
+                    (id_by_title[title], project_id, title, video[2])
+                    for title, video in pending.items()
+                    if title in id_by_title
+                ]
+                video_embeddings = self._prefetch_video_embeddings(rows, known={
+                    youtube_id: known_embeddings[title]
+                    for youtube_id, _pid, title, _desc in rows
+                    if title in known_embeddings
+                })
+                sem_scores = self._semantic_scores(rows, video_embeddings)
+
+                for youtube_id, _pid, title, desc in rows:
+                    _, _, _, dur_time, _, views, likes = pending[title]
+                    added_ids.append(youtube_id)
+
+                    # Generate and insert features
+                    duration_sec = None
+                    if dur_time:
+                        parts = dur_time.split(':')
+                        duration_sec = int(parts[0]) * 3600 + int(parts[1]) * 60 + int(parts[2])
+
+                    sem_score = sem_scores[youtube_id]
+
+                    features_list = self.features.video_features(
+                        seconds=duration_sec,
+                        published_at=None,
+                        views=views,
+                        sem_score=sem_score,
+                        likes=likes
+                    )
+
+                    sem_display = sem_score if sem_score is not None else 0.0
+                    logger.debug("Computed features for youtube_id %s (sem_score=%.4f)", youtube_id, sem_display)
+                    features_by_youtube_id[youtube_id] = features_list
+
+            # Write the features using db_crud, which only deletes/inserts rows that differ
+            if not self.db_insert.insert_youtube_features_bulk(features_by_youtube_id):
+                raise RuntimeError("Failed to insert YouTube features")
+            self._invalidate_features_cache()
+            logger.info(f"Successfully inserted features for {len(features_by_youtube_id)} videos")
+        except Exception:
+            self.cx.cnx.rollback()
+            raise
 
-            # Insert features using db_crud
-            sem_display = sem_score if sem_score is not None else 0.0
-            logger.info(f"Inserting features for youtube_id {youtube_id} (sem_score={sem_display:.4f})")
-            self.db_insert.insert_youtube_features(youtube_id, features_list)
-            logger.info(f"Successfully inserted features for youtube_id {youtube_id}")
-        
         logger.info(f"Committing {len(added_ids)} added videos")
         self.cx.cnx.commit()
         logger.info(f"add_candidates complete, returning {len(added_ids)} added IDs")
@@ -283,7 +496,51 @@ class JaccardVideoRecommender:
 
     # ---------------- Private helpers ---------------- 
     
-    def _load_project_features(self, project_id: int, include_likes: bool) -> Dict[str, Set[str]]:
+    def _load_like_ids(self, cur, project_id: int) -> Tuple[List[int], List[int]]:
+        """Return (liked youtube ids, disliked youtube ids) for a project."""
+        cur.execute(_PROJECT_VIDEO_LIKES_SQL, (project_id,))
+        liked_ids: List[int] = []
+        disliked_ids: List[int] = []
+        for target_id, is_liked in cur.fetchall():
+            (liked_ids if is_liked else disliked_ids).append(target_id)
+        return liked_ids, disliked_ids
+
+    def _load_profiles(
+        self,
+        liked_ids: List[int],
+        disliked_ids: List[int],
+        include_likes: bool
+    ) -> Tuple[Dict[str, FrozenSet[str]], Dict[str, int], Optional[Dict[str, FrozenSet[str]]], Optional[Dict[str, int]]]:
+        """
+        Return frozen (project features, lens, disliked features, lens) for the given like ids.
+        Profiles are cached by the exact liked/disliked id sets, so a like change produces a new
+        key; the cache is cleared with the feature cache whenever youtube_features is rewritten.
+        """
+        key = (frozenset(liked_ids), frozenset(disliked_ids), include_likes)
+        cached = self._profile_cache.get(key)
+        if cached is not None:
+            self._profile_cache.move_to_end(key)
+            return cached
+
+        # Warm the feature cache for liked and disliked videos with a single query, so the
+        # two loaders below are served from memory instead of issuing one query each
+        self._get_youtube_features_many((liked_ids if include_likes else []) + disliked_ids)
+
+        proj_features, proj_lens = self._freeze_features(
+            self._load_project_features(liked_ids, include_likes=include_likes)
+        )
+        disliked_features, disliked_lens = None, None
+        raw_disliked = self._load_disliked_features(disliked_ids)
+        if raw_disliked:
+            disliked_features, disliked_lens = self._freeze_features(raw_disliked)
+
+        profiles = (proj_features, proj_lens, disliked_features, disliked_lens)
+        self._profile_cache[key] = profiles
+        if len(self._profile_cache) > _PROFILE_CACHE_SIZE:
+            self._profile_cache.popitem(last=False)
+        return profiles
+
+    def _load_project_features(self, liked_ids: List[int], include_likes: bool) -> Dict[str, Set[str]]:
         """
         Load project features grouped by category.
         Returns Dict mapping category -> Set of feature values.
@@ -291,87 +548,97 @@ class JaccardVideoRecommender:
         Note: Project features come from liked videos only, not from project embedding directly.
         The project embedding is used to compute semantic similarity scores for candidate videos.
         """
-        self._ensure_connection()
-        cur = self.cx.cursor
-
         # Initialize feature categories
-        features_by_category = {cat: set() for cat in self.WEIGHTS.keys()}
+        features_by_category = self._empty_feat_template()
 
         # Add liked videos' features
         if include_likes:
-            cur.execute("""
-                SELECT target_id
-                FROM likes
-                WHERE project_id=%s AND target_type='youtube' AND isLiked = TRUE
-            """, (project_id,))
-
-            for (target_id,) in cur.fetchall():
-                video_features = self._get_youtube_features(target_id)
+            for video_features in self._get_youtube_features_many(liked_ids).values():
                 for category, feature_set in video_features.items():
                     features_by_category[category] |= feature_set
 
         return features_by_category
 
-    def _load_disliked_features(self, project_id: int) -> Optional[Dict[str, Set[str]]]:
+    def _load_disliked_features(self, disliked_ids: List[int]) -> Optional[Dict[str, Set[str]]]:
         """Load features from disliked videos."""
-        self._ensure_connection()
-        cur = self.cx.cursor
-        cur.execute("""
-            SELECT target_id
-            FROM likes
-            WHERE project_id=%s AND target_type='youtube' AND isLiked = FALSE
-        """, (project_id,))
-        
-        disliked_ids = [r[0] for r in cur.fetchall()]
         if not disliked_ids:
             return None
         
-        features_by_category = {cat: set() for cat in self.WEIGHTS.keys()}
-        for target_id in disliked_ids:
-            video_features = self._get_youtube_features(target_id)
+        features_by_category = self._empty_feat_template()
+        for video_features in self._get_youtube_features_many(disliked_ids).values():
             for category, feature_set in video_features.items():
                 features_by_category[category] |= feature_set
         
         return features_by_category
 
-    def _get_youtube_features(self, youtube_id: int) -> Dict[str, Set[str]]:
-        """Get features for a youtube video from youtube_features table."""
-        self._ensure_connection()
-        cur = self.cx.cursor
-        cur.execute("""
-            SELECT category, feature
-            FROM youtube_features
-            WHERE youtube_id = %s
-        """, (youtube_id,))
-        
-        features_by_category = {cat: set() for cat in self.WEIGHTS.keys()}
-        for category, feature_value in cur.fetchall():
-            features_by_category[category].add(feature_value)
-        
-        return features_by_category
+    def _get_youtube_features_many(self, youtube_ids: List[int]) -> Dict[int, Dict[str, FrozenSet[str]]]:
+        """
+        Get features for many youtube videos, loading every cache miss with one IN query.
+        Results are LRU-cached per youtube_id and must be treated as read-only.
+        """
+        found: Dict[int, Dict[str, FrozenSet[str]]] = {}
+        misses: List[int] = []
+        for youtube_id in youtube_ids:
+            cached = self._features_cache.get(youtube_id)
+            if cached is None:
+                misses.append(youtube_id)
+            else:
+                self._features_cache.move_to_end(youtube_id)
+                found[youtube_id] = cached
+
+        if misses:
+            loaded = {youtube_id: self._empty_feat_template() for youtube_id in misses}
+            placeholders = ",".join(["%s"] * len(misses))
+            cur = self.cx.cursor
+            cur.execute(f"""
+                SELECT youtube_id, category, feature
+                FROM youtube_features
+                WHERE youtube_id IN ({placeholders})
+            """, misses)
+            for youtube_id, category, feature_value in cur.fetchall():
+                loaded[youtube_id][category].add(sys.intern(feature_value))
+            for youtube_id, features_by_category in loaded.items():
+                found[youtube_id] = self._cache_features(youtube_id, features_by_category)
+
+        return found
+
+    def _cache_features(self, youtube_id: int, features_by_category: Dict[str, Set[str]]) -> Dict[str, FrozenSet[str]]:
+        """Freeze a video's features and store them in the LRU cache."""
+        frozen = {cat: frozenset(feats) for cat, feats in features_by_category.items()}
+        self._features_cache[youtube_id] = frozen
+        if len(self._features_cache) > _FEATURE_CACHE_SIZE:
+            self._features_cache.popitem(last=False)
+        return frozen
+
+    def _invalidate_features_cache(self) -> None:
+        """Drop cached video features and profiles after youtube_features has been rewritten."""
+        self._features_cache.clear()
+        self._profile_cache.clear()
 
     def _extract_features_from_youtube_row(self, row: Tuple) -> Dict[str, Set[str]]:
         """
-        Extract features from a youtube table row.
-        row format: (youtube_id, video_title, video_description, video_duration_sec, video_url, video_views, video_likes)
+        Extract features from a candidate row returned by _fetch_unrecommended_videos.
+        row format: (youtube_id, video_title, video_description, video_duration_sec, video_url, video_views, video_likes, features_json)
         """
-        # Fetch features from youtube_features table
-        youtube_id = row[0]
-        self._ensure_connection()
-        cur = self.cx.cursor
-        cur.execute("""
-            SELECT category, feature
-            FROM youtube_features
-            WHERE youtube_id = %s
-        """, (youtube_id,))
-        
-        features_by_category = {cat: set() for cat in self.WEIGHTS.keys()}
-        for category, feature_value in cur.fetchall():
-            features_by_category[category].add(feature_value)
-        
+        # features_json is a JSON array of [category, feature] pairs aggregated in SQL;
+        # a video without features yields a single [null, null] pair from the LEFT JOIN
+        # Feature strings are interned so equal values share one object across the cached
+        # sets and the feature-id vocabulary, making hashing/equality checks identity-fast
+        features_by_category = self._empty_feat_template()
+        for category, feature_value in orjson.loads(row[7] or "[]"):
+            if category is not None:
+                features_by_category[category].add(sys.intern(feature_value))
         return features_by_category
 
-    def _compute_semantic_similarity(self, project_id: int, youtube_id: int, video_title: str, video_description: str) -> Optional[float]:
+    def _compute_semantic_similarity(
+        self,
+        project_id: int,
+        youtube_id: int,
+        video_title: str,
+        video_description: str,
+        video_embedding: Optional[List[float]] = None,
+        project_embedding: Optional[List[float]] = None
+    ) -> Optional[float]:
         """
         Compute semantic similarity between project and video using embeddings.
         Uses cached video embeddings to avoid redundant API calls.
@@ -381,19 +648,23 @@ class JaccardVideoRecommender:
             youtube_id: The YouTube video ID (for caching)
             video_title: Video title
             video_description: Video description
+            video_embedding: Already-resolved video embedding, skips the cache lookup
+            project_embedding: Already-loaded project embedding, skips the DB read
 
         Returns:
             Cosine similarity score between 0 and 1, or None if embeddings unavailable
         """
         try:
             # Get project embedding
-            project_embedding = self.db_select.get_project_embedding(project_id)
+            if project_embedding is None:
+                project_embedding = self.db_select.get_project_embedding(project_id)
             if not project_embedding:
                 logger.warning(f"No project embedding found for project_id={project_id}")
                 return None
 
             # Check cache for video embedding
-            video_embedding = self.db_select.get_youtube_video_embedding(youtube_id)
+            if video_embedding is None:
+                video_embedding = self.db_select.get_youtube_video_embedding(youtube_id)
 
             if video_embedding is None:
                 # Cache miss - generate and cache embedding
@@ -402,9 +673,9 @@ class JaccardVideoRecommender:
 
                 # Cache the embedding for future use
                 self.db_insert.upsert_youtube_video_embedding(youtube_id, video_embedding)
-                logger.info(f"Generated and cached new embedding for youtube_id={youtube_id}")
+                logger.debug("Generated and cached new embedding for youtube_id=%s", youtube_id)
             else:
-                logger.info(f"Using cached embedding for youtube_id={youtube_id}")
+                logger.debug("Using cached embedding for youtube_id=%s", youtube_id)
 
             # Compute cosine similarity
             similarity = self.embedding.cosine_similarity(project_embedding, video_embedding)
@@ -421,43 +692,141 @@ class JaccardVideoRecommender:
             logger.error(f"Error computing semantic similarity: {e}")
             return None
 
+    def _semantic_scores(self, rows: List[Tuple], video_embeddings: Dict[int, List[float]]) -> Dict[int, Optional[float]]:
+        """
+        Semantic similarity of each row's video to its project, youtube_id -> score in [0, 1]
+        (None when unavailable). Each project's embedding is read once and all of its videos
+        are scored with one matrix-vector product; videos without a resolved embedding fall
+        back to _compute_semantic_similarity one at a time.
+
+        row format: (youtube_id, project_id, video_title, video_description, ...)
+        """
+        rows_by_project: Dict[int, List[Tuple]] = {}
+        for row in rows:
+            rows_by_project.setdefault(row[1], []).append(row)
+
+        scores: Dict[int, Optional[float]] = {}
+        for project_id, project_rows in rows_by_project.items():
+            project_embedding = self.db_select.get_project_embedding(project_id)
+            if not project_embedding:
+                logger.warning(f"No project embedding found for project_id={project_id}")
+                scores.update((row[0], None) for row in project_rows)
+                continue
+
+            embedded = [row[0] for row in project_rows if row[0] in video_embeddings]
+            if embedded:
+                try:
+                    similarities = self.embedding.cosine_similarity_batch(
+                        project_embedding, [video_embeddings[youtube_id] for youtube_id in embedded]
+                    )
+                    # Clamp to [0, 1] to handle any edge cases
+                    scores.update(zip(embedded, np.clip(similarities, 0.0, 1.0).tolist()))
+                except Exception as e:
+                    logger.error(f"Error computing semantic similarity: {e}")
+                    scores.update((youtube_id, None) for youtube_id in embedded)
+
+            for row in project_rows:
+                if row[0] not in video_embeddings:
+                    scores[row[0]] = self._compute_semantic_similarity(
+                        project_id, row[0], row[2], row[3], project_embedding=project_embedding
+                    )
+        return scores
+
+    def _prefetch_video_embeddings(self, rows: List[Tuple], known: Optional[Dict[int, List[float]]] = None) -> Dict[int, List[float]]:
+        """
+        Resolve embeddings for youtube rows, generating all cache misses with one batched
+        embeddings request; if that fails they are left for the per-video fallback.
+        known holds embeddings already computed for newly inserted rows: they are stored
+        with the generated ones instead of being looked up or generated again.
+
+        row format: (youtube_id, project_id, video_title, video_description, ...)
+        """
+        known = known or {}
+        lookup = [row for row in rows if row[0] not in known]
+        # Cached embeddings for the whole batch come back in one query
+        embeddings: Dict[int, List[float]] = self.db_select.get_youtube_video_embeddings(
+            [row[0] for row in lookup]
+        ) or {}
+        misses: List[Tuple[int, str]] = [
+            (row[0], f"{row[2]}; {row[3]}") for row in lookup if row[0] not in embeddings
+        ]
+
+        new_embeddings = dict(known)
+        if misses:
+            try:
+                generated = self.embedding.embed_texts([text for _yid, text in misses])
+            except Exception as e:
+                logger.error(f"Error embedding {len(misses)} video texts: {e}")
+                generated = []
+            new_embeddings.update(
+                (youtube_id, video_embedding)
+                for (youtube_id, _text), video_embedding in zip(misses, generated)
+            )
+            logger.info(f"Generated {len(new_embeddings) - len(known)} new video embeddings")
+        if new_embeddings:
+            # One multi-row upsert instead of one round trip per embedding
+            self.db_insert.upsert_youtube_video_embeddings_bulk(new_embeddings)
+            embeddings.update(new_embeddings)
+
+        return embeddings
+
     def _upsert_youtube_features(self, project_id: Optional[int] = None) -> None:
         """
         Update features for YouTube videos in the youtube_features table.
         Uses db_crud functions instead of direct cursor operations.
 
         CRITICAL CHANGE: Now computes actual semantic similarity using embeddings.
+
+        Videos are read in keyset-paginated batches of _REFRESH_BATCH_SIZE rows so the
+        whole youtube table is never materialized in memory at once.
         """
         self._ensure_connection()
         cur = self.cx.cursor
-        if project_id is None:
-            cur.execute("""
-                SELECT youtube_id, project_id, video_title, video_description,
-                       TIME_TO_SEC(video_duration) AS video_duration_sec,
-                       video_views, video_likes
-                FROM youtube
-            """)
-        else:
-            cur.execute("""
-                SELECT youtube_id, project_id, video_title, video_description,
-                       TIME_TO_SEC(video_duration) AS video_duration_sec,
-                       video_views, video_likes
-                FROM youtube
-                WHERE project_id = %s
-            """, (project_id,))
-
-        rows = cur.fetchall()
+        project_filter = "" if project_id is None else "AND project_id = %s"
+        sql = f"""
+            SELECT youtube_id, project_id, video_title, video_description,
+                   TIME_TO_SEC(video_duration) AS video_duration_sec,
+                   video_views, video_likes
+            FROM youtube
+            WHERE youtube_id > %s {project_filter}
+            ORDER BY youtube_id
+            LIMIT %s
+        """
+
+        # Refresh every video's features in one transaction with a single commit
+        last_id = 0
+        try:
+            while True:
+                params = (last_id, _REFRESH_BATCH_SIZE) if project_id is None else (last_id, project_id, _REFRESH_BATCH_SIZE)
+                cur.execute(sql, params)
+                rows = cur.fetchall()
+                if not rows:
+                    break
+                self._refresh_features_batch(rows)
+                last_id = rows[-1][0]
+                if len(rows) < _REFRESH_BATCH_SIZE:
+                    break
+        except Exception:
+            self.cx.cnx.rollback()
+            raise
+        self.cx.cnx.commit()
+
+    def _refresh_features_batch(self, rows: List[Tuple]) -> Dict[int, List[tuple]]:
+        """
+        Recompute and replace features for one batch of youtube rows.
+        row format: (youtube_id, project_id, video_title, video_description, video_duration_sec, video_views, video_likes)
+        Returns the persisted features as youtube_id -> list of (category, feature) tuples.
+        """
+        features_by_youtube_id: Dict[int, List[tuple]] = {}
+        video_embeddings = self._prefetch_video_embeddings(rows)
+        sem_scores = self._semantic_scores(rows, video_embeddings)
         for row in rows:
             youtube_id = row[0]
-            vid_project_id = row[1]
-            video_title = row[2]
-            video_description = row[3]
             duration_sec = row[4]
             views = row[5]
             likes = row[6]
 
-            # CRITICAL: Compute actual semantic similarity
-            sem_score = self._compute_semantic_similarity(vid_project_id, youtube_id, video_title, video_description)
+            sem_score = sem_scores[youtube_id]
 
             # Generate features with actual semantic score
             features_list = self.features.video_features(
@@ -468,13 +837,19 @@ class JaccardVideoRecommender:
                 likes=likes
             )
 
-            # Insert features using db_crud
-            self.db_insert.insert_youtube_features(youtube_id, features_list)
+            features_by_youtube_id[youtube_id] = features_list
 
-    def _fetch_unrecommended_videos(self, project_id: int) -> List[Tuple]:
-        """Fetch videos that haven't been recommended yet."""
-        self._ensure_connection()
-        cur = self.cx.cursor
+        # Sync features using db_crud, which only deletes/inserts rows that differ
+        if not self.db_insert.insert_youtube_features_bulk(features_by_youtube_id):
+            raise RuntimeError("Failed to refresh YouTube features")
+        self._invalidate_features_cache()
+        return features_by_youtube_id
+
+    def _fetch_unrecommended_videos(self, cur, project_id: int) -> List[Tuple]:
+        """
+        Fetch videos that haven't been recommended yet, together with their features
+        aggregated into a JSON array so scoring needs no further round trips.
+        """
         cur.execute("""
             SELECT
                 y.youtube_id,
@@ -483,34 +858,34 @@ class JaccardVideoRecommender:
                 TIME_TO_SEC(y.video_duration) AS video_duration_sec,
                 y.video_url,
                 y.video_views,
-                y.video_likes
+                y.video_likes,
+                JSON_ARRAYAGG(JSON_ARRAY(f.category, f.feature)) AS features_json
             FROM youtube y
+            LEFT JOIN youtube_features f ON f.youtube_id = y.youtube_id
             WHERE y.project_id=%s
             AND NOT EXISTS (
                 SELECT 1 FROM youtube_has_rec yhr
                 WHERE yhr.youtube_id = y.youtube_id 
                 AND yhr.hasBeenRecommended = TRUE
             )
+            GROUP BY y.youtube_id
         """, (project_id,))
         results = cur.fetchall()
         return results
 
-    def _mark_topk_as_recommended(self, project_id: int, top_videos: List[Tuple[int, str, Optional[str], float]]) -> None:
+    def _mark_topk_as_recommended(self, cur, project_id: int, top_videos: List[Tuple[int, str, Optional[str], float]]) -> None:
         """Mark top-k videos as recommended in youtube_has_rec."""
-        cur = self.cx.cursor
-        for youtube_id, _title, _url, _score in top_videos:
-            # Check if entry already exists
-            cur.execute("SELECT youtube_has_rec_id FROM youtube_has_rec WHERE youtube_id=%s", (youtube_id,))
-            if cur.fetchone():
-                # Update existing entry
-                cur.execute(
-                    "UPDATE youtube_has_rec SET hasBeenRecommended=TRUE WHERE youtube_id=%s",
-                    (youtube_id,)
-                )
-            else:
-                # Insert new entry
-                cur.execute(
-                    "INSERT INTO youtube_has_rec(youtube_id, hasBeenRecommended) VALUES (%s, TRUE)",
-                    (youtube_id,)
-                )
+        youtube_ids = [youtube_id for youtube_id, _title, _url, _score in top_videos]
+        if not youtube_ids:
+            return
+
+        # One upsert covers both existing and missing entries (youtube_id is unique)
+        cur.executemany(
+            """
+            INSERT INTO youtube_has_rec(youtube_id, hasBeenRecommended)
+            VALUES (%s, TRUE)
+            ON DUPLICATE KEY UPDATE hasBeenRecommended = TRUE
+            """,
+            [(youtube_id,) for youtube_id in youtube_ids]
+        )
         self.cx.cnx.commit()
@@ -1,19 +1,195 @@
+import hashlib
 import os
+import random
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, Optional, List
+import httpx
 import openai
+import tiktoken
 from openai import OpenAI
-import json
 from ..utils.logging_config import get_logger
 
 # Initialize logger for this module
 logger = get_logger(__name__)
 
+# Shared client, created on first use so its connection pool is reused across requests
+_client: Optional[OpenAI] = None
+_client_lock = threading.Lock()
+
+# Connection pool shared by every request thread; sized for concurrent Flask workers and
+# the parallel YouTube/paper generation so connections are kept alive instead of re-handshaked
+_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=50, keepalive_expiry=30)
+_HTTP_TIMEOUT = httpx.Timeout(60.0, connect=5.0)
+
+# Exact-match cache of successful deterministic (temperature == 0) responses. Sampled
+# requests are never cached: callers at a higher temperature want a fresh completion.
+_RESPONSE_CACHE_SIZE = 1024
+_response_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+_response_cache_lock = threading.Lock()
+
+# Proactive throttling at the account's per-minute limits, so bursts wait locally instead of
+# spending a round trip on a 429. Sized for gpt-4o-mini on usage tier 1.
+_REQUESTS_PER_MINUTE = 500
+_TOKENS_PER_MINUTE = 200_000
+
+class _TokenBucket:
+    """Thread-safe token bucket that refills continuously to `capacity` over `period` seconds."""
+
+    def __init__(self, capacity: float, period: float = 60.0):
+        self.capacity = capacity
+        self.rate = capacity / period
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, amount: float = 1.0) -> None:
+        """Take `amount` tokens, sleeping until enough have refilled."""
+        amount = min(amount, self.capacity)
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= amount:
+                    self._tokens -= amount
+                    return
+                wait = (amount - self._tokens) / self.rate
+            time.sleep(wait)
+
+_request_bucket = _TokenBucket(_REQUESTS_PER_MINUTE)
+_token_bucket = _TokenBucket(_TOKENS_PER_MINUTE)
+
+# Context window per model, used to fit max_tokens to the prompt before calling out
+_MODEL_CONTEXT_TOKENS = {
+    "gpt-4o-mini": 128_000,
+    "gpt-4o": 128_000,
+}
+
+@lru_cache(maxsize=None)
+def _encoding(model: str) -> "tiktoken.Encoding":
+    """Tokenizer for a model (loading one reads its BPE table, so keep one per model)."""
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+@lru_cache(maxsize=256)
+def _count_text_tokens(model: str, text: str) -> int:
+    """Token count of one message body; the static system prompts hit this cache."""
+    return len(_encoding(model).encode(text))
+
+def count_tokens(messages: List[Dict[str, str]], model: str = "gpt-4o-mini") -> int:
+    """Prompt tokens for a chat request, including the per-message and reply-priming overhead."""
+    return sum(_count_text_tokens(model, m["content"] or "") for m in messages) + 3 * len(messages) + 3
+
+def _prompt_tokens(messages: List[Dict[str, str]], model: str) -> int:
+    """count_tokens, or a ~4 characters per token estimate when the tokenizer cannot be loaded."""
+    try:
+        return count_tokens(messages, model)
+    except Exception as e:
+        logger.warning(f"Token count unavailable ({e}); estimating from message length")
+        return sum(len(m["content"] or "") for m in messages) // 4 + 3 * len(messages) + 3
+
+# Transient upstream failures: retried with backoff, and counted by the circuit breaker
+_RETRYABLE_ERRORS = (openai.APIConnectionError, openai.RateLimitError, openai.InternalServerError)
+_MAX_ATTEMPTS = 4
+_BACKOFF_BASE = 0.5
+_BACKOFF_MAX = 8.0
+
+class _CircuitBreaker:
+    """
+    Process-wide breaker: after `fail_max` consecutive failed calls, reject calls for
+    `reset_timeout` seconds, then let one trial call through.
+    """
+
+    def __init__(self, fail_max: int = 10, reset_timeout: float = 30.0):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at >= self.reset_timeout:
+                # Half-open: admit this call; a failure re-opens the breaker immediately
+                self._opened_at = None
+                self._failures = self.fail_max - 1
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._failures >= self.fail_max:
+                self._opened_at = time.monotonic()
+
+_breaker = _CircuitBreaker()
+
+def _create_with_retry(client: OpenAI, **kwargs):
+    """chat.completions.create with exponential backoff and full jitter on transient errors."""
+    for attempt in range(_MAX_ATTEMPTS):
+        try:
+            return client.chat.completions.create(**kwargs)
+        except _RETRYABLE_ERRORS as e:
+            if attempt == _MAX_ATTEMPTS - 1:
+                raise
+            delay = random.uniform(0, min(_BACKOFF_MAX, _BACKOFF_BASE * 2 ** attempt))
+            logger.warning(f"OpenAI call failed ({type(e).__name__}), retrying in {delay:.2f}s")
+            time.sleep(delay)
+
+def _response_cache_key(model: str, max_tokens: int, system_message: Optional[str], prompt: str) -> bytes:
+    """Digest identifying a deterministic request."""
+    text = "\x00".join((model, str(max_tokens), system_message or "", prompt))
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+def _get_client() -> OpenAI:
+    """Return the module-wide OpenAI client, creating it on first call."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # Get API key from environment
+                api_key = os.getenv("OPENAI_API_KEY")
+                if not api_key:
+                    raise ValueError("OPENAI_API_KEY environment variable is not set")
+                # Retries are handled by _create_with_retry so they share the circuit breaker
+                _client = OpenAI(
+                    api_key=api_key,
+                    max_retries=0,
+                    timeout=_HTTP_TIMEOUT,
+                    http_client=openai.DefaultHttpxClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+                )
+    return _client
+
+def warm_up() -> None:
+    """Create the shared client and load the tokenizer ahead of the first request (e.g. at server startup)."""
+    try:
+        _get_client()
+    except ValueError as e:
+        logger.warning(f"Skipping OpenAI client warm-up: {e}")
+    try:
+        _encoding("gpt-4o-mini")
+    except Exception as e:
+        logger.warning(f"Skipping tokenizer warm-up: {e}")
+
 def run_request(
     prompt: str,
     model: str = "gpt-4o-mini",
     temperature: float = 0.1,
     max_tokens: int = 4000,
-    system_message: Optional[str] = None
+    system_message: Optional[str] = None,
+    prompt_cache_key: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Make a request to OpenAI API to generate a JSON schema.
@@ -24,6 +200,7 @@ def run_request(
         temperature (float): Creativity level (0.0 = focused, 1.0 = creative)
         max_tokens (int): Maximum tokens for the response
         system_message (str, optional): Additional system instructions
+        prompt_cache_key (str, optional): Groups requests sharing a static prefix for OpenAI prompt caching
     
     Returns:
         Dict[str, Any]: OpenAI API response
@@ -33,13 +210,20 @@ def run_request(
         Exception: For other API errors
     """
     
-    # Get API key from environment
-    api_key = os.getenv("OPENAI_API_KEY")
-    if not api_key:
-        raise ValueError("OPENAI_API_KEY environment variable is not set")
-    
-    # Initialize OpenAI client
-    client = OpenAI(api_key=api_key)
+    # Deterministic requests are answered from the cache when the same request was seen before
+    cache_key = None
+    if temperature == 0.0:
+        cache_key = _response_cache_key(model, max_tokens, system_message, prompt)
+        with _response_cache_lock:
+            cached = _response_cache.get(cache_key)
+            if cached is not None:
+                _response_cache.move_to_end(cache_key)
+        if cached is not None:
+            logger.info("OpenAI response served from cache")
+            return dict(cached)
+
+    # Reuse the pooled OpenAI client
+    client = _get_client()
     
     # Prepare messages
     messages = []
@@ -57,20 +241,51 @@ def run_request(
         "content": prompt
     })
     
+    # Fit the completion budget into the context window instead of failing after a round trip
+    prompt_tokens = _prompt_tokens(messages, model)
+    context_tokens = _MODEL_CONTEXT_TOKENS.get(model)
+    if context_tokens is not None and prompt_tokens + max_tokens > context_tokens:
+        if prompt_tokens >= context_tokens:
+            logger.error(f"Prompt is {prompt_tokens} tokens, over the {context_tokens}-token context of {model}")
+            return {
+                "success": False,
+                "error": f"Prompt too long: {prompt_tokens} tokens exceeds the {context_tokens}-token context window",
+                "error_type": "api_error"
+            }
+        max_tokens = context_tokens - prompt_tokens
+        logger.warning(f"Reduced max_tokens to {max_tokens} to fit the context window")
+    
+    # Fail fast while OpenAI is down instead of tying up a worker on a doomed call
+    if not _breaker.allow():
+        logger.error("OpenAI circuit breaker is open; skipping call")
+        return {
+            "success": False,
+            "error": "OpenAI API unavailable (circuit breaker open)",
+            "error_type": "api_error"
+        }
+    
+    # Wait for rate-limit headroom (prompt plus worst-case completion) before calling out
+    _request_bucket.acquire()
+    _token_bucket.acquire(prompt_tokens + max_tokens)
+    
     try:
         # Make the API call
-        response = client.chat.completions.create(
+        response = _create_with_retry(
+            client,
             model=model,
             messages=messages,
             temperature=temperature,
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            extra_body={"prompt_cache_key": prompt_cache_key} if prompt_cache_key else None
         )
         
+        _breaker.record_success()
+        
         # Extract the response content
         content = response.choices[0].message.content
         logger.info(f"OpenAI API call successful. Tokens used: {response.usage.total_tokens}")
         
-        return {
+        result = {
             "success": True,
             "content": content,
             "model": model,
@@ -80,7 +295,22 @@ def run_request(
                 "total_tokens": response.usage.total_tokens
             }
         }
+        if cache_key is not None:
+            with _response_cache_lock:
+                _response_cache[cache_key] = result
+                if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+                    _response_cache.popitem(last=False)
+            result = dict(result)
+        return result
         
+    except _RETRYABLE_ERRORS as e:
+        _breaker.record_failure()
+        logger.error(f"OpenAI API error: {str(e)}")
+        return {
+            "success": False,
+            "error": f"OpenAI API error: {str(e)}",
+            "error_type": "api_error"
+        }
     except openai.APIError as e:
         logger.error(f"OpenAI API error: {str(e)}")
         return {
@@ -94,4 +324,4 @@ def run_request(
             "success": False,
             "error": f"Unexpected error: {str(e)}",
             "error_type": "general_error"
-        }
\ No newline at end of file
+        }
@@ -1,15 +1,18 @@
 from flask import Blueprint, request, jsonify
-import sys
-import os
 
-# Add the parent directory to the path to import from openai module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from ..task_manager import TaskManager
-from ..config.constants import LIKE_DISLIKE
+from ..task_manager import get_task_manager
+from ..config.constants import LIKE_DISLIKE, LIKE_DISLIKE_UPDATE
+from ..utils.validation import LIKE_TARGET_TYPES, like_error, like_update_error
 
 like_dislike_bp = Blueprint('like_dislike', __name__)
 
+# Success messages for every (isLiked, target_type) pair, built once
+_SUCCESS_MESSAGES = {
+    (is_liked, target_type): f'Successfully {"liked" if is_liked else "disliked"} {target_type} item'
+    for is_liked in (True, False)
+    for target_type in LIKE_TARGET_TYPES
+}
+
 @like_dislike_bp.route(LIKE_DISLIKE, methods=['POST'])
 def like_dislike():
     """
@@ -17,37 +20,27 @@ def like_dislike():
     Creates a like/dislike record in the database.
     """
     try:
-        data = request.get_json()
-        
-        # Validate required fields for create_like function
-        required_fields = ["project_id", "target_type", "target_id", "isLiked"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'Missing required field: {field}',
-                    'success': False
-                }), 400
-        
-        # Validate target_type is either 'youtube' or 'paper'
-        if data['target_type'] not in ['youtube', 'paper']:
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
             return jsonify({
-                'error': 'target_type must be either "youtube" or "paper"',
+                'error': 'Invalid or missing JSON body',
                 'success': False
             }), 400
         
-        # Validate isLiked is boolean
-        if not isinstance(data['isLiked'], bool):
+        # Validate required fields, target_type and isLiked in one call
+        error = like_error(data)
+        if error:
             return jsonify({
-                'error': 'isLiked must be a boolean value',
+                'error': error,
                 'success': False
             }), 400
         
-        like_id = TaskManager().handle_like_dislike(data)
+        like_id = get_task_manager().handle_like_dislike(data)
         
         return jsonify({
             'success': True,
             'like_id': like_id,
-            'message': f'Successfully {"liked" if data["isLiked"] else "disliked"} {data["target_type"]} item'
+            'message': _SUCCESS_MESSAGES[data['isLiked'], data['target_type']]
         }), 200
 
     except Exception as e:
@@ -56,37 +49,31 @@ def like_dislike():
             'success': False
         }), 500
 
-@like_dislike_bp.route(LIKE_DISLIKE + "update/", methods=['PUT'])
+@like_dislike_bp.route(LIKE_DISLIKE_UPDATE, methods=['PUT'])
 def update_like_dislike():
     """
     Updates an existing like/dislike record.
     Toggles the isLiked value for the given liked_disliked_id.
     """
     try:
-        data = request.get_json()
-        
-        # Validate required fields
-        required_fields = ["liked_disliked_id"]
-        for field in required_fields:
-            if field not in data:
-                return jsonify({
-                    'error': f'Missing required field: {field}',
-                    'success': False
-                }), 400
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
+            return jsonify({
+                'error': 'Invalid or missing JSON body',
+                'success': False
+            }), 400
         
-        # Validate liked_disliked_id is a positive integer
-        try:
-            liked_disliked_id = int(data['liked_disliked_id'])
-            if liked_disliked_id <= 0:
-                raise ValueError("liked_disliked_id must be a positive integer")
-        except (ValueError, TypeError):
+        # Validate liked_disliked_id is present and a positive integer
+        error = like_update_error(data)
+        if error:
             return jsonify({
-                'error': 'liked_disliked_id must be a positive integer',
+                'error': error,
                 'success': False
             }), 400
+        liked_disliked_id = int(data['liked_disliked_id'])
             
         # Update the like/dislike record
-        TaskManager().handle_like_dislike_update(data)
+        get_task_manager().handle_like_dislike_update(data)
         
         return jsonify({
             'success': True,
@@ -106,7 +93,7 @@ def get_project_likes(project_id):
     Get all likes/dislikes for a specific project.
     """
     try:
-        likes = TaskManager().handle_get_likes_for_project(project_id)
+        likes = get_task_manager().handle_get_likes_for_project(project_id)
         
         return jsonify({
             'success': True,
@@ -1,20 +1,37 @@
-from flask import Blueprint, request, jsonify
-import sys
-import os
+from flask import Blueprint, Response, current_app, request, jsonify, stream_with_context
 
-from ..task_manager import TaskManager
+from ..task_manager import TaskManager, get_task_manager
 from ..utils.logging_config import get_logger
-
-# Add the parent directory to the path to import from openai module
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
-from ..config.constants import GENERATE_SUBMISSION
+from ..utils.validation import RequiredFields, NotNullFields
+from ..utils.http_cache import etag_cached
+from ..config.constants import (
+    GENERATE_SUBMISSION, GENERATE_SUBMISSION_STREAM, GENERATE_SUBMISSION_PANEL,
+    YOUTUBE_BATCH, PAPERS_BATCH, MAX_BATCH_IDS
+)
 
 # Initialize logger for this module
 logger = get_logger(__name__)
 
 submission_bp = Blueprint('submission', __name__)
 
+_submission_fields = RequiredFields(['topic', 'objective', 'guidelines', 'user_id'])
+_panel_fields = RequiredFields(['topic', 'objective', 'guidelines', 'user_special_instructions', 'panel_name', 'user_id'])
+_panel_id_fields = NotNullFields(['project_id', 'query_id'])
+
+def _batch_ids(data):
+    """Return (ids, error) for a {"ids": [...]} batch body."""
+    if not isinstance(data, dict):
+        return None, 'Invalid or missing JSON body'
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids:
+        return None, 'ids must be a non-empty list'
+    if len(ids) > MAX_BATCH_IDS:
+        return None, f'At most {MAX_BATCH_IDS} ids per request'
+    # bool is an int subclass, so reject it explicitly
+    if not all(type(i) is int and i > 0 for i in ids):
+        return None, 'ids must be positive integers'
+    return ids, None
+
 @submission_bp.route(GENERATE_SUBMISSION, methods=['POST'])
 def generate_submission():
     """
@@ -22,21 +39,25 @@ def generate_submission():
     """
     logger.info("RECIEVED API CALL REQUEST")
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
+            return jsonify({
+                'error': 'Invalid or missing JSON body',
+                'success': False
+            }), 400
         
         # Validate required fields
-        logger.info(f"DATA: {data}")
-        required_fields = ['topic', 'objective', 'guidelines', 'user_id']
-        for field in required_fields:
-            if field not in data or not data[field] or (isinstance(data[field], str) and data[field].strip() == ''):
-                logger.warning(f"Missing or empty required field: {field}")
-                return jsonify({
-                    'error': f'Missing or empty required field: {field}',
-                    'success': False
-                }), 400
+        logger.debug("DATA: %s", data)
+        error = _submission_fields.error(data)
+        if error:
+            logger.warning(error)
+            return jsonify({
+                'error': error,
+                'success': False
+            }), 400
         
         # Handle submission.
-        task_manager_response = TaskManager().handle_submission(data)
+        task_manager_response = get_task_manager().handle_submission(data)
         
         return jsonify({
             'success': True,
@@ -52,34 +73,69 @@ def generate_submission():
             'success': False
         }), 500
 
-@submission_bp.route(GENERATE_SUBMISSION + "individual_panel/", methods=['POST'])
+@submission_bp.route(GENERATE_SUBMISSION_STREAM, methods=['POST'])
+def generate_submission_stream():
+    """
+    Same as generate_submission, but streams results as server-sent events so the client can
+    render each panel as soon as it is ready: 'project', then 'youtube' / 'papers' in
+    completion order, then 'done' with the project_id/query_id (or 'error').
+    """
+    data = request.get_json(silent=True, cache=False)
+    if not isinstance(data, dict):
+        return jsonify({
+            'error': 'Invalid or missing JSON body',
+            'success': False
+        }), 400
+    error = _submission_fields.error(data)
+    if error:
+        logger.warning(error)
+        return jsonify({
+            'error': error,
+            'success': False
+        }), 400
+
+    def events():
+        failed = False
+        done = {}
+        for event, payload in get_task_manager().iter_submission_events(data):
+            failed = failed or event == 'error'
+            if event == 'project':
+                done = payload
+            yield b"event: " + event.encode() + b"\ndata: " + current_app.json.dumps_bytes(payload) + b"\n\n"
+        if not failed:
+            yield b"event: done\ndata: " + current_app.json.dumps_bytes(done) + b"\n\n"
+
+    return Response(stream_with_context(events()), mimetype='text/event-stream')
+
+@submission_bp.route(GENERATE_SUBMISSION_PANEL, methods=['POST'])
 def generate_submission_individual_panel():
     """
     Generate panel-specific submission content.
     """
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
+            return jsonify({
+                'error': 'Invalid or missing JSON body',
+                'success': False
+            }), 400
         
         # Validate required fields
-        string_fields = ['topic', 'objective', 'guidelines', 'user_special_instructions', 'panel_name', 'user_id']
-        for field in string_fields:
-            if field not in data or not data[field] or (isinstance(data[field], str) and data[field].strip() == ''):
-                return jsonify({
-                    'error': f'Missing or empty required field: {field}',
-                    'success': False
-                }), 400
+        error = _panel_fields.error(data) or _panel_id_fields.error(data)
+        if error:
+            return jsonify({
+                'error': error,
+                'success': False
+            }), 400
         
-        # Validate ID fields
-        id_fields = ['project_id', 'query_id']
-        for field in id_fields:
-            if field not in data or data[field] is None:
-                return jsonify({
-                    'error': f'Missing required field: {field}',
-                    'success': False
-                }), 400
+        if data['panel_name'] not in TaskManager.PANEL_TASKS:
+            return jsonify({
+                'error': f"Unknown panel_name: {data['panel_name']}",
+                'success': False
+            }), 400
         
         # handle submission.
-        task_manager_response = TaskManager().handle_submission(data)
+        task_manager_response = get_task_manager().handle_submission(data)
 
         return jsonify({
             'success': True,
@@ -88,19 +144,20 @@ def generate_submission_individual_panel():
             'papers': task_manager_response['papers']
         }), 200
     except Exception as e:
-        logger.error(f"Exception in generate_submission: {str(e)}")
+        logger.error(f"Exception in generate_submission_individual_panel: {str(e)}")
         return jsonify({
             'error': str(e),
             'success': False
         }), 500
 
 @submission_bp.route('/api/youtube/<int:youtube_id>', methods=['GET'])
+@etag_cached()
 def get_youtube_video(youtube_id):
     """
     Get a single YouTube video by ID.
     """
     try:
-        video = TaskManager().handle_get_youtube_video(youtube_id)
+        video = get_task_manager().handle_get_youtube_video(youtube_id)
         
         if not video:
             return jsonify({
@@ -121,12 +178,13 @@ def get_youtube_video(youtube_id):
         }), 500
 
 @submission_bp.route('/api/papers/<int:paper_id>', methods=['GET'])
+@etag_cached()
 def get_paper(paper_id):
     """
     Get a single paper by ID.
     """
     try:
-        paper = TaskManager().handle_get_paper(paper_id)
+        paper = get_task_manager().handle_get_paper(paper_id)
         
         if not paper:
             return jsonify({
@@ -144,4 +202,50 @@ def get_paper(paper_id):
         return jsonify({
             'error': str(e),
             'success': False
-        }), 500
\ No newline at end of file
+        }), 500
+
+@submission_bp.route(YOUTUBE_BATCH, methods=['POST'])
+def get_youtube_videos():
+    """
+    Get several YouTube videos in one request, keyed by youtube_id.
+    """
+    ids, error = _batch_ids(request.get_json(silent=True, cache=False))
+    if error:
+        return jsonify({
+            'error': error,
+            'success': False
+        }), 400
+    try:
+        return jsonify({
+            'success': True,
+            'videos': get_task_manager().handle_get_youtube_videos(ids)
+        }), 200
+    except Exception as e:
+        logger.error(f"Exception in get_youtube_videos: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
+
+@submission_bp.route(PAPERS_BATCH, methods=['POST'])
+def get_papers():
+    """
+    Get several papers in one request, keyed by paper_id.
+    """
+    ids, error = _batch_ids(request.get_json(silent=True, cache=False))
+    if error:
+        return jsonify({
+            'error': error,
+            'success': False
+        }), 400
+    try:
+        return jsonify({
+            'success': True,
+            'papers': get_task_manager().handle_get_papers(ids)
+        }), 200
+    except Exception as e:
+        logger.error(f"Exception in get_papers: {str(e)}")
+        return jsonify({
+            'error': str(e),
+            'success': False
+        }), 500
@@ -1,15 +1,16 @@
 from flask import Blueprint, request, jsonify
-import sys
-import os
 
-from ..task_manager import TaskManager
+from ..task_manager import get_task_manager
 from ..utils.logging_config import get_logger
+from ..utils.validation import RequiredFields
 
 # Initialize logger for this module
 logger = get_logger(__name__)
 
 user_bp = Blueprint('user', __name__)
 
+_user_fields = RequiredFields(['name', 'email'])
+
 @user_bp.route('/api/users/', methods=['POST'])
 def create_user():
     """
@@ -17,20 +18,24 @@ def create_user():
     """
     logger.info("Received create user API call")
     try:
-        data = request.get_json()
+        data = request.get_json(silent=True, cache=False)
+        if not isinstance(data, dict):
+            return jsonify({
+                'error': 'Invalid or missing JSON body',
+                'success': False
+            }), 400
         
         # Validate required fields
-        required_fields = ['name', 'email']
-        for field in required_fields:
-            if field not in data or not data[field] or data[field].strip() == '':
-                logger.warning(f"Missing or empty required field: {field}")
-                return jsonify({
-                    'error': f'Missing or empty required field: {field}',
-                    'success': False
-                }), 400
+        error = _user_fields.error(data)
+        if error:
+            logger.warning(error)
+            return jsonify({
+                'error': error,
+                'success': False
+            }), 400
         
         # Sign up/login user
-        user = TaskManager().handle_user_signup(data)
+        user = get_task_manager().handle_user_signup(data)
         return jsonify({
             'success': True,
             'user_id': user['user_id'],
@@ -50,7 +55,7 @@ def get_user(user_id):
     Get user information by user_id.
     """
     try:
-        user = TaskManager().handle_get_user(user_id)
+        user = get_task_manager().handle_get_user(user_id)
         return jsonify({
             'success': True,
             'user_id': user['user_id'],
@@ -70,7 +75,7 @@ def get_user_projects(user_id):
     Get all projects for a user by user_id.
     """
     try:
-        projects = TaskManager().handle_user_projects(user_id)
+        projects = get_task_manager().handle_user_projects(user_id)
         return jsonify({
             'success': True,
             'projects': projects
@@ -88,7 +93,7 @@ def get_complete_project_data(project_id):
     Get complete project data including project, queries, papers, youtube videos, and likes.
     """
     try:
-        complete_data = TaskManager().handle_get_complete_project_data(project_id)
+        complete_data = get_task_manager().handle_get_complete_project_data(project_id)
         return jsonify({
             'success': True,
             'project': complete_data['project'],
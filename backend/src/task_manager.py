@@ -1,75 +1,154 @@
-from src.generate_content.youtube_generator import YoutubeGenerator
-from src.generate_content.paper_generator import PaperGenerator
+import time
+from operator import itemgetter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from flask import g
+
 from src.db.db_crud.insert import DBInsert
 from src.db.db_crud.select_db import DBSelect
-from src.utils.logging_config import get_logger
+from src.utils.logging_config import debug_enabled, get_logger
 from src.db.db_crud.change import DBChange
 from src.db.connector import Connector
-from src.generate_content.create_query import CreateQuery
-from src.text_embedding.embedding import Embedding
+from src.utils.validation import like_error, like_update_error
+from src.utils.ttl_cache import TTLCache
+
+# Worker threads shared by every request for overlapping I/O-bound work (panel generation,
+# the project embedding call). Reusing one bounded pool avoids spawning threads per request
+# and caps how many upstream calls the process makes at once.
+_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="task-manager")
+
+# Fields a new project is created from, read out of the submission body in one call
+_PROJECT_FIELDS = itemgetter('user_id', 'topic', 'objective', 'guidelines')
+
+# Complete project bundles by project_id. Every write that changes a bundle (new query,
+# papers, videos, likes) pops its entry, so the TTL only bounds how long an entry lives.
+_PROJECT_DATA_CACHE = TTLCache(maxsize=1024, ttl=60)
+
+# Users by normalized email. /api/users/ doubles as login, so repeat sign-ins skip the
+# lookup; only existing users are cached and user rows are never updated.
+_USERS_BY_EMAIL = TTLCache(maxsize=4096, ttl=300)
+# Same user dicts by user_id, for GET /api/users/<id>; seeded by signup/login
+_USERS_BY_ID = TTLCache(maxsize=8192, ttl=300)
+
+# Project lists by user_id, for the dashboard's re-polls; popped when the user creates a project
+_USER_PROJECTS_CACHE = TTLCache(maxsize=4096, ttl=30)
 
 class TaskManager:
+    # Result key and task method for each panel; Generic submissions run all of them
+    PANEL_TASKS = {
+        'YouTube': ('youtube', '_handle_youtube_task'),
+        'Papers': ('papers', '_handle_paper_task'),
+    }
+
     def __init__(self):
         # Shared connector per TaskManager instance
         self.cx = Connector()
         self.db_insert = DBInsert()
         self.db_select = DBSelect()
+        self.db_change = DBChange()
         # Share connector and disable auto connection management
         self.db_insert.connector = self.cx
         self.db_select.connector = self.cx
+        self.db_change.connector = self.cx
         self.db_insert.manage_connection = False
         self.db_select.manage_connection = False
+        self.db_change.manage_connection = False
         self._youtube_generator = None  # Lazy initialization
         self._paper_generator = None
         self._create_query = None
+        self._embedding = None
         self.logger = get_logger(__name__)
     
+    # The generators, query builder and embedding client are imported on first use: they pull
+    # in openai/langchain/Google clients, which the read-only endpoints never need
     @property
     def youtube_generator(self):
         if self._youtube_generator is None:
+            from src.generate_content.youtube_generator import YoutubeGenerator
             self._youtube_generator = YoutubeGenerator()
         return self._youtube_generator
     
     @property
     def paper_generator(self):
         if self._paper_generator is None:
+            from src.generate_content.paper_generator import PaperGenerator
             self._paper_generator = PaperGenerator()
         return self._paper_generator
     
     @property
     def create_query(self):
         if self._create_query is None:
-            self._create_query = CreateQuery()
+            from src.generate_content.create_query import CreateQuery
+            self._create_query = CreateQuery(self.db_select)
         return self._create_query
 
+    @property
+    def embedding(self):
+        if self._embedding is None:
+            from src.text_embedding.embedding import Embedding
+            self._embedding = Embedding()
+        return self._embedding
+
+    def close(self):
+        """Release the MySQL connections held by this TaskManager and its generators."""
+        connectors = [self.cx]
+        if self._youtube_generator is not None:
+            generator = self._youtube_generator
+            connectors += [generator.cx, generator.db_select.connector, generator.db_insert.connector]
+        if self._paper_generator is not None:
+            generator = self._paper_generator
+            connectors += [generator.connector, generator.db_select.connector, generator.db_insert.connector]
+        for connector in connectors:
+            connector.close_connection()
+
     def handle_submission(self, data):
         """
         Handle submission based on panel type.
         Returns structured response with generated content IDs.
         """
-        panel_name = data.get('panel_name', 'Generic')
         result = {
             'success': True,
-            'panel_name': panel_name,
+            'panel_name': data.get('panel_name', 'Generic'),
             'papers': [],
             'youtube': []
         }
+        for event, payload in self.iter_submission_events(data):
+            if event == 'error':
+                result['success'] = False
+                result['error'] = payload['error']
+            else:
+                result.update(payload)
+        return result
+
+    def iter_submission_events(self, data):
+        """
+        Run a submission and yield (event, payload) pairs as each part completes:
+        'project' (Generic only) with project_id/query_id, then 'youtube' and/or 'papers'
+        in completion order, or 'error' with the failure message.
+        """
+        panel_name = data.get('panel_name', 'Generic')
         
         try:
+            # The project/query writes below share one connection (the DB helpers don't
+            # open their own); it is released before the long-running generation starts
+            self.cx.open_connection()
+            # Built once: it is the Generic query, and the fallback query for panel submissions
+            default_query_text = self._default_query_text(data['topic'], data['objective'])
+
             # Always create project and query for new submissions
             if panel_name == 'Generic':
                 self.logger.info("Handling Generic panel submission")
-                project_id = self._handle_project_task(data)
-                query_id = self._handle_default_query_task(data, project_id)
-                result['project_id'] = project_id
-                result['query_id'] = query_id
+                project_id, query_id = self._handle_project_task(data, default_query_text)
+                yield 'project', {'project_id': project_id, 'query_id': query_id}
             else:
+                if panel_name not in self.PANEL_TASKS:
+                    raise ValueError(f"Unknown panel_name: {panel_name}")
                 # For panel-specific submissions, use provided project/query IDs
-                self.logger.info(f"Handling panel-specific submission: {panel_name}")
+                self.logger.info("Handling panel-specific submission: %s", panel_name)
                 project_id = data['project_id']
-                self.logger.info(f"Using project_id: {project_id}")
-                query_id = self._handle_query_task(data, project_id)
-                self.logger.info(f"Generated query_id: {query_id}")
+                self.logger.info("Using project_id: %s", project_id)
+                query_id, query_text = self._handle_query_task(data, project_id)
+                self.logger.info("Generated query_id: %s", query_id)
                 
                 # Validate that the project exists
                 if project_id is None:
@@ -78,27 +157,46 @@ class TaskManager:
                 # If query_id is 0 or None, create a default query
                 if query_id is None or query_id == 0:
                     self.logger.info("Creating default query as backup")
-                    query_id = self._handle_default_query_task(data, project_id)
+                    query_id = self._handle_default_query_task(project_id, default_query_text)
+                    query_text = default_query_text
+                _PROJECT_DATA_CACHE.pop(project_id)
             
-            self.logger.info(f"here is the project id: {project_id}")
+            self.logger.info("here is the project id: %s", project_id)
+            # The panel tasks use the generators' own connections
+            self.cx.close_connection()
             
             # Handle content generation based on panel type
-            if panel_name in ['Generic', 'YouTube']:
-                self.logger.info("Generating YouTube videos")
-                youtube_videos = self._handle_youtube_task(data, project_id, query_id)
-                result['youtube'] = youtube_videos or []
-                
-            if panel_name in ['Generic', 'Papers']:
-                self.logger.info("Generating papers")
-                papers = self._handle_paper_task(data, project_id, query_id)
-                result['papers'] = papers or []
+            if panel_name == 'Generic':
+                # The panels are independent I/O-bound jobs (each generator has its own DB
+                # connection), so run them concurrently.
+                self.logger.info("Generating YouTube videos and papers concurrently")
+                data['project_id'] = project_id
+                query_result = self._query_row(query_id, project_id, default_query_text)
+                futures = {
+                    _EXECUTOR.submit(self._run_panel_task, key, method, data, project_id, query_id, query_result): key
+                    for key, method in self.PANEL_TASKS.values()
+                }
+                for future in as_completed(futures):
+                    key = futures[future]
+                    # A failed panel is reported on its own; the other panel's results still go out
+                    try:
+                        items = future.result() or []
+                    except Exception as e:
+                        self.logger.error("Error generating %s: %s", key, e)
+                        yield 'error', {'error': f"{key}: {str(e)}"}
+                        continue
+                    yield key, {key: items}
+            else:
+                key, method = self.PANEL_TASKS[panel_name]
+                self.logger.info("Generating %s for panel %s", key, panel_name)
+                query_result = self._query_row(query_id, project_id, query_text)
+                yield key, {key: self._run_panel_task(key, method, data, project_id, query_id, query_result) or []}
             
         except Exception as e:
-            self.logger.error(f"Error in handle_submission: {str(e)}")
-            result['success'] = False
-            result['error'] = str(e)
-        
-        return result
+            self.logger.error("Error in handle_submission: %s", e)
+            yield 'error', {'error': str(e)}
+        finally:
+            self.cx.close_connection()
     
     def handle_like_dislike(self, data):
         """
@@ -106,19 +204,10 @@ class TaskManager:
         Returns like ID or raises exception on failure.
         """
         try:
-            # Validate required fields
-            required_fields = ['project_id', 'target_type', 'target_id', 'isLiked']
-            for field in required_fields:
-                if field not in data:
-                    raise ValueError(f"Missing required field: {field}")
-            
-            # Validate target_type
-            if data['target_type'] not in ['youtube', 'paper']:
-                raise ValueError("target_type must be either 'youtube' or 'paper'")
-            
-            # Validate boolean isLiked
-            if not isinstance(data['isLiked'], bool):
-                raise ValueError("isLiked must be a boolean value")
+            # Validate required fields, target_type and isLiked
+            error = like_error(data)
+            if error:
+                raise ValueError(error)
             
             # Create the like/dislike record
             like_id = self.db_insert.create_like(
@@ -133,14 +222,15 @@ class TaskManager:
                 self.logger.error(error_msg)
                 raise RuntimeError(error_msg)
             
-            self.logger.info(f"Successfully created like/dislike record with ID {like_id}")
+            _PROJECT_DATA_CACHE.pop(data['project_id'])
+            self.logger.info("Successfully created like/dislike record with ID %s", like_id)
             return like_id
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_like_dislike: {str(e)}")
+            self.logger.error("Validation error in handle_like_dislike: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_like_dislike: {str(e)}")
+            self.logger.error("Unexpected error in handle_like_dislike: %s", e)
             raise RuntimeError(f"Failed to create like/dislike record: {str(e)}")
     
     def handle_like_dislike_update(self, data):
@@ -149,34 +239,38 @@ class TaskManager:
         Toggles the isLiked status for the given record.
         """
         try:
-            # Validate required fields
-            if 'liked_disliked_id' not in data:
-                raise ValueError("Missing required field: liked_disliked_id")
-            
-            # Validate liked_disliked_id is a positive integer
-            try:
-                liked_disliked_id = int(data['liked_disliked_id'])
-                if liked_disliked_id <= 0:
-                    raise ValueError("liked_disliked_id must be a positive integer")
-            except (ValueError, TypeError):
-                raise ValueError("liked_disliked_id must be a positive integer")
+            # Validate liked_disliked_id is present and a positive integer
+            error = like_update_error(data)
+            if error:
+                raise ValueError(error)
+            liked_disliked_id = int(data['liked_disliked_id'])
             
+            # The update and the project lookup below share one connection
+            self.cx.open_connection()
             # Update the like/dislike record
-            success = DBChange().update_like(liked_disliked_id)
+            success = self.db_change.update_like(liked_disliked_id)
             
             if not success:
                 error_msg = f"Failed to update like/dislike record with ID {liked_disliked_id}"
                 self.logger.error(error_msg)
                 raise RuntimeError(error_msg)
             
-            self.logger.info(f"Successfully updated like/dislike record with ID {liked_disliked_id}")
+            # The update is keyed by like id only, so look up which project bundle it touched
+            like = self.db_select.get_like(liked_disliked_id)
+            if like is not None:
+                _PROJECT_DATA_CACHE.pop(like['project_id'])
+            else:
+                _PROJECT_DATA_CACHE.clear()
+            self.logger.info("Successfully updated like/dislike record with ID %s", liked_disliked_id)
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_like_dislike_update: {str(e)}")
+            self.logger.error("Validation error in handle_like_dislike_update: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_like_dislike_update: {str(e)}")
+            self.logger.error("Unexpected error in handle_like_dislike_update: %s", e)
             raise RuntimeError(f"Failed to update like/dislike record: {str(e)}")
+        finally:
+            self.cx.close_connection()
     
     def handle_user_signup(self, data):
         """
@@ -184,37 +278,27 @@ class TaskManager:
         Returns user data or raises exception on failure.
         """
         try:
+            email = data['email'].strip().lower()
+            user = _USERS_BY_EMAIL.get(email)
+            if user is not None:
+                self.logger.info("User already exists with ID: %s", user['user_id'])
+                return dict(user)
+
             self.cx.open_connection()
-            # Check if user already exists
-            existing_user = self.db_select.get_user_by_email(data['email'].strip().lower())
-            
-            if existing_user:
-                # User already exists, return existing user info
-                self.logger.info(f"User already exists with ID: {existing_user['user_id']}")
-                return {
-                    'user_id': existing_user['user_id'],
-                    'name': existing_user['name'],
-                    'email': existing_user['email']
-                }
-            
-            # Create new user
-            user_id = self.db_insert.create_user(data['name'].strip(), data['email'].strip().lower())
-            
-            if user_id is None:
+            # Returns the existing user for this email, or creates it in the same statement
+            user = self.db_insert.get_or_create_user(data['name'].strip(), email)
+            if user is None:
                 raise RuntimeError("Failed to create user in database")
-            
-            self.logger.info(f"Successfully created user with ID: {user_id}")
-            return {
-                'user_id': user_id,
-                'name': data['name'].strip(),
-                'email': data['email'].strip().lower()
-            }
+            self.logger.info("Signed up user with ID: %s", user['user_id'])
+            _USERS_BY_EMAIL.set(email, user)
+            _USERS_BY_ID.set(user['user_id'], user)
+            return dict(user)
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_user_signup: {str(e)}")
+            self.logger.error("Validation error in handle_user_signup: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_user_signup: {str(e)}")
+            self.logger.error("Unexpected error in handle_user_signup: %s", e)
             raise RuntimeError(f"Failed to handle user signup: {str(e)}")
         finally:
             self.cx.close_connection()
@@ -225,29 +309,36 @@ class TaskManager:
         Returns user data or raises exception on failure.
         """
         try:
-            self.cx.open_connection()
             # Validate required fields
             if 'email' not in data:
                 raise ValueError("Missing required field: email")
             
-            # Get user by email
-            user = self.db_select.get_user_by_email(data['email'].strip().lower())
-            
-            if not user:
-                raise ValueError("User not found with this email")
+            email = data['email'].strip().lower()
+            user = _USERS_BY_EMAIL.get(email)
+            if user is None:
+                self.cx.open_connection()
+                # Get user by email
+                found = self.db_select.get_user_by_email(email)
+                
+                if not found:
+                    raise ValueError("User not found with this email")
+                
+                user = {
+                    'user_id': found['user_id'],
+                    'name': found['name'],
+                    'email': found['email']
+                }
+                _USERS_BY_EMAIL.set(email, user)
+                _USERS_BY_ID.set(user['user_id'], user)
             
-            self.logger.info(f"User login successful for ID: {user['user_id']}")
-            return {
-                'user_id': user['user_id'],
-                'name': user['name'],
-                'email': user['email']
-            }
+            self.logger.info("User login successful for ID: %s", user['user_id'])
+            return dict(user)
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_user_login: {str(e)}")
+            self.logger.error("Validation error in handle_user_login: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_user_login: {str(e)}")
+            self.logger.error("Unexpected error in handle_user_login: %s", e)
             raise RuntimeError(f"Failed to handle user login: {str(e)}")
         finally:
             self.cx.close_connection()
@@ -258,29 +349,34 @@ class TaskManager:
         Returns user data or raises exception on failure.
         """
         try:
-            self.cx.open_connection()
             # Validate user_id
             if not user_id or user_id <= 0:
                 raise ValueError("Invalid user_id provided")
             
-            # Get user by user_id
-            user = self.db_select.get_user(user_id)
-            
-            if not user:
-                raise ValueError("User not found with this ID")
+            user = _USERS_BY_ID.get(user_id)
+            if user is None:
+                self.cx.open_connection()
+                # Get user by user_id
+                found = self.db_select.get_user(user_id)
+                
+                if not found:
+                    raise ValueError("User not found with this ID")
+                
+                user = {
+                    'user_id': found['user_id'],
+                    'name': found['name'],
+                    'email': found['email']
+                }
+                _USERS_BY_ID.set(user_id, user)
             
-            self.logger.info(f"Retrieved user with ID: {user['user_id']}")
-            return {
-                'user_id': user['user_id'],
-                'name': user['name'],
-                'email': user['email']
-            }
+            self.logger.info("Retrieved user with ID: %s", user['user_id'])
+            return dict(user)
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_get_user: {str(e)}")
+            self.logger.error("Validation error in handle_get_user: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_get_user: {str(e)}")
+            self.logger.error("Unexpected error in handle_get_user: %s", e)
             raise RuntimeError(f"Failed to get user: {str(e)}")
         finally:
             self.cx.close_connection()
@@ -291,25 +387,33 @@ class TaskManager:
         Returns list of projects or raises exception on failure.
         """
         try:
-            self.cx.open_connection()
             # Validate user_id
             if not user_id or user_id <= 0:
                 raise ValueError("Invalid user_id provided")
             
+            projects = _USER_PROJECTS_CACHE.get(user_id)
+            if projects is not None:
+                self.logger.info("Served %s projects for user ID %s from cache", len(projects), user_id)
+                return list(projects)
+
+            self.cx.open_connection()
             # Get projects for user
             projects = self.db_select.get_user_projects(user_id)
             
             if projects is None:
                 raise RuntimeError("Failed to retrieve projects from database")
             
-            self.logger.info(f"Retrieved {len(projects)} projects for user ID: {user_id}")
+            # An empty list is also what a failed query returns, so only non-empty lists are cached
+            if projects:
+                _USER_PROJECTS_CACHE.set(user_id, list(projects))
+            self.logger.info("Retrieved %s projects for user ID: %s", len(projects), user_id)
             return projects
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_user_projects: {str(e)}")
+            self.logger.error("Validation error in handle_user_projects: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_user_projects: {str(e)}")
+            self.logger.error("Unexpected error in handle_user_projects: %s", e)
             raise RuntimeError(f"Failed to get user projects: {str(e)}")
         finally:
             self.cx.close_connection()
@@ -331,14 +435,14 @@ class TaskManager:
             if likes is None:
                 raise RuntimeError("Failed to retrieve likes from database")
             
-            self.logger.info(f"Retrieved {len(likes)} likes for project ID: {project_id}")
+            self.logger.info("Retrieved %s likes for project ID: %s", len(likes), project_id)
             return likes
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_get_likes_for_project: {str(e)}")
+            self.logger.error("Validation error in handle_get_likes_for_project: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_get_likes_for_project: {str(e)}")
+            self.logger.error("Unexpected error in handle_get_likes_for_project: %s", e)
             raise RuntimeError(f"Failed to get likes for project: {str(e)}")
         finally:
             self.cx.close_connection()
@@ -354,20 +458,28 @@ class TaskManager:
             if not project_id or project_id <= 0:
                 raise ValueError("Invalid project_id provided")
             
+            complete_data = _PROJECT_DATA_CACHE.get(project_id)
+            if complete_data is not None:
+                self.logger.info("Served complete data for project ID %s from cache", project_id)
+                return complete_data
+
+            # Taken before the read: a write that lands meanwhile keeps the result out of the cache
+            token = _PROJECT_DATA_CACHE.token(project_id)
             # Get complete project data
             complete_data = self.db_select.get_complete_project_data(project_id)
             
             if complete_data is None:
                 raise RuntimeError("Failed to retrieve project data from database")
             
-            self.logger.info(f"Retrieved complete data for project ID: {project_id}")
+            _PROJECT_DATA_CACHE.set_if_unchanged(project_id, complete_data, token)
+            self.logger.info("Retrieved complete data for project ID: %s", project_id)
             return complete_data
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_get_complete_project_data: {str(e)}")
+            self.logger.error("Validation error in handle_get_complete_project_data: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_get_complete_project_data: {str(e)}")
+            self.logger.error("Unexpected error in handle_get_complete_project_data: %s", e)
             raise RuntimeError(f"Failed to get complete project data: {str(e)}")
         finally:
             self.cx.close_connection()
@@ -387,17 +499,17 @@ class TaskManager:
             video = self.db_select.get_youtube_video(youtube_id)
             
             if not video:
-                self.logger.info(f"YouTube video not found with ID: {youtube_id}")
+                self.logger.info("YouTube video not found with ID: %s", youtube_id)
                 return None
             
-            self.logger.info(f"Retrieved YouTube video with ID: {youtube_id}")
+            self.logger.info("Retrieved YouTube video with ID: %s", youtube_id)
             return video
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_get_youtube_video: {str(e)}")
+            self.logger.error("Validation error in handle_get_youtube_video: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_get_youtube_video: {str(e)}")
+            self.logger.error("Unexpected error in handle_get_youtube_video: %s", e)
             raise RuntimeError(f"Failed to get YouTube video: {str(e)}")
         finally:
             self.cx.close_connection()
@@ -417,54 +529,107 @@ class TaskManager:
             paper = self.db_select.get_paper(paper_id)
             
             if not paper:
-                self.logger.info(f"Paper not found with ID: {paper_id}")
+                self.logger.info("Paper not found with ID: %s", paper_id)
                 return None
             
-            self.logger.info(f"Retrieved paper with ID: {paper_id}")
+            self.logger.info("Retrieved paper with ID: %s", paper_id)
             return paper
             
         except ValueError as e:
-            self.logger.error(f"Validation error in handle_get_paper: {str(e)}")
+            self.logger.error("Validation error in handle_get_paper: %s", e)
             raise
         except Exception as e:
-            self.logger.error(f"Unexpected error in handle_get_paper: {str(e)}")
+            self.logger.error("Unexpected error in handle_get_paper: %s", e)
             raise RuntimeError(f"Failed to get paper: {str(e)}")
         finally:
             self.cx.close_connection()
 
+    def handle_get_youtube_videos(self, youtube_ids):
+        """
+        Get several YouTube videos in one query.
+        Returns {youtube_id: video} for the IDs that exist.
+        """
+        try:
+            self.cx.open_connection()
+            # dict.fromkeys drops repeated IDs but keeps the caller's order
+            youtube_ids = list(dict.fromkeys(youtube_ids))
+            videos = self.db_select.get_youtube_videos(youtube_ids)
+            if videos is None:
+                raise RuntimeError("Failed to get YouTube videos")
+            self.logger.info("Retrieved %s of %s requested YouTube videos", len(videos), len(youtube_ids))
+            return videos
+        finally:
+            self.cx.close_connection()
+
+    def handle_get_papers(self, paper_ids):
+        """
+        Get several papers in one query.
+        Returns {paper_id: paper} for the IDs that exist.
+        """
+        try:
+            self.cx.open_connection()
+            paper_ids = list(dict.fromkeys(paper_ids))
+            papers = self.db_select.get_papers(paper_ids)
+            if papers is None:
+                raise RuntimeError("Failed to get papers")
+            self.logger.info("Retrieved %s of %s requested papers", len(papers), len(paper_ids))
+            return papers
+        finally:
+            self.cx.close_connection()
+
     
-    def _handle_project_task(self, data):
-        """
-        Create a new project in the database.
-        Returns project ID or raises exception on failure.
-        """
-        # create embedding for the project.
-        embedding_text = f"{data['topic']}; {data['objective']}; {data['guidelines']}"
-        embedding = Embedding().embed_text(embedding_text)
-        self.logger.info(f"Embedding type: {type(embedding)}")
-        project_id = self.db_insert.create_project(
-            data['user_id'], 
-            data['topic'], 
-            data['objective'], 
-            data['guidelines']
+    def _run_panel_task(self, key, method, *args):
+        """Run one panel task, logging when it starts and how long it took (or when it failed)."""
+        self.logger.info("TASK_STARTED %s", key)
+        started = time.perf_counter()
+        try:
+            items = getattr(self, method)(*args)
+        except Exception:
+            self.logger.info("TASK_FAILED %s after %.2fs", key, time.perf_counter() - started)
+            raise
+        self.logger.info("TASK_COMPLETED %s in %.2fs", key, time.perf_counter() - started)
+        return items
+
+    def _handle_project_task(self, data, query_text):
+        """
+        Create a new project together with its default query (query_text) in the database.
+        Returns (project ID, query ID) or raises exception on failure.
+        """
+        # Bind the validated fields once; they feed both the inserts and the embedding text
+        user_id, topic, objective, guidelines = _PROJECT_FIELDS(data)
+
+        # create embedding for the project. The OpenAI call runs on a worker thread while the
+        # project row is inserted, so the two round trips overlap instead of running back to back.
+        embedding_text = f"{query_text}; {guidelines}"
+        embedding_future = _EXECUTOR.submit(self.embedding.embed_text, embedding_text)
+        project_id, query_id = self.db_insert.create_project_with_query(
+            user_id, topic, objective, guidelines, query_text
         )
+        embedding = embedding_future.result()
+        self.logger.info("Embedding type: %s", type(embedding))
         
         if project_id is None:
             error_msg = "Failed to create project"
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
+        _USER_PROJECTS_CACHE.pop(user_id)
         
-        self.logger.info(f"Created project with ID: {project_id}")
+        self.logger.info("Created project with ID: %s", project_id)
+        self.logger.info("Created query with ID: %s", query_id)
         # Store project embedding in project_embeddings
         self.db_insert.create_project_embedding(project_id, embedding)
-        return project_id
+        return project_id, query_id
+    
+    @staticmethod
+    def _default_query_text(topic, objective):
+        """The query text every new project starts with."""
+        return f"{topic}; {objective}"
     
-    def _handle_default_query_task(self, data, project_id):
+    def _handle_default_query_task(self, project_id, query_text):
         """
         Create a default query for the project.
         Returns query ID or raises exception on failure.
         """
-        query_text = f"{data['topic']}; {data['objective']}"
         query_id = self.db_insert.create_query(project_id, query_text)
         
         if query_id is None:
@@ -472,7 +637,7 @@ class TaskManager:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
 
-        self.logger.info(f"Created query with ID: {query_id}")
+        self.logger.info("Created query with ID: %s", query_id)
         return query_id
     
     def _handle_query_task(self, data, project_id):
@@ -492,66 +657,101 @@ class TaskManager:
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
             
-        self.logger.info(f"Created query with ID: {query_id}")
-        return query_id
+        self.logger.info("Created query with ID: %s", query_id)
+        return query_id, query_text
+
+    @staticmethod
+    def _query_row(query_id, project_id, query_text):
+        """
+        The query row as get_query would return it, for a query this submission just wrote;
+        the panel tasks take it directly instead of reading the row back.
+        """
+        return {
+            'query_id': query_id,
+            'project_id': project_id,
+            'queries_text': query_text,
+            'special_instructions': None
+        }
             
-    def _handle_paper_task(self, data, project_id, query_id):
-        self.logger.info(f"Starting paper task for project_id: {project_id}, query_id: {query_id}")
-        query_result = self.db_select.get_query(query_id)
+    def _handle_paper_task(self, data, project_id, query_id, query_result=None):
+        self.logger.info("Starting paper task for project_id: %s, query_id: %s", project_id, query_id)
+        if query_result is None:
+            query_result = self.db_select.get_query(query_id)
         if not query_result:
             error_msg = f"Query not found with ID: {query_id}"
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
 
-        self.logger.info(f"Retrieved query result: {query_result}")
+        self.logger.debug("Retrieved query result: %s", query_result)
         # Ensure query_id is in data dict for paper_generator
         data_with_query_id = {**data, 'query_id': query_id}
         paper_data = self.paper_generator.generate_paper(data_with_query_id, query_result)
-        self.logger.info(f"Generated paper data: {type(paper_data)}")
+        self.logger.info("Generated paper data: %s", type(paper_data))
 
         # Papers are already in database and formatted correctly from paper_generator
         papers = paper_data.get('papers', [])
-        self.logger.info(f"Paper generator returned {len(papers)} papers")
+        self.logger.info("Paper generator returned %s papers", len(papers))
 
         # Papers already have all necessary fields (paper_id, paper_title, pdf_link, authors, etc.)
         # Just return them as-is for the response
-        for paper in papers:
-            self.logger.info(f"Paper {paper.get('paper_id')}: {paper.get('paper_title', 'Unknown')[:50]}")
+        if debug_enabled(self.logger):
+            for paper in papers:
+                self.logger.debug("Paper %s: %s", paper.get('paper_id'), paper.get('paper_title', 'Unknown')[:50])
 
-        self.logger.info(f"SUCCESSFULLY RAN API CALL - Created project ID: {project_id}")
-        self.logger.info(f"Returning {len(papers)} papers")
+        self.logger.info("SUCCESSFULLY RAN API CALL - Created project ID: %s", project_id)
+        self.logger.info("Returning %s papers", len(papers))
+        _PROJECT_DATA_CACHE.pop(project_id)
         return papers  
     
-    def _handle_youtube_task(self, data, project_id, query_id):
+    def _handle_youtube_task(self, data, project_id, query_id, query_result=None):
         """
         Generate YouTube videos and insert them into the database.
         Returns list of videos with their database IDs.
+        query_result may be passed in when the query row was already loaded by the caller.
         """
         # add project id to data.
         data['project_id'] = project_id
         # Generate YouTube videos
-        self.logger.info(f"Starting YouTube task for project_id: {project_id}, query_id: {query_id}")
-        query_result = self.db_select.get_query(query_id)
+        self.logger.info("Starting YouTube task for project_id: %s, query_id: %s", project_id, query_id)
+        if query_result is None:
+            query_result = self.db_select.get_query(query_id)
         if not query_result:
             error_msg = f"Query not found with ID: {query_id}"
             self.logger.error(error_msg)
             raise RuntimeError(error_msg)
         
-        self.logger.info(f"Retrieved query result: {query_result}")
+        self.logger.debug("Retrieved query result: %s", query_result)
         query_text = query_result['queries_text']
-        self.logger.info(f"Extracted query text: {query_text}")
+        self.logger.info("Extracted query text: %s", query_text)
         youtube_data = self.youtube_generator.generate_youtube_videos(data, query_result)
         youtube_videos = youtube_data.get('youtube', [])
         
-        # youtube_videos already has full details including youtube_id
-        # Just format them for return
-        youtube_with_ids = []
-        for video in youtube_videos:
-            if video.get('youtube_id'):
-                # Already has database ID from add_candidates
-                video_with_id = video.copy()
-                youtube_with_ids.append(video_with_id)
-                self.logger.info(f"Retrieved YouTube video with ID {video.get('youtube_id')}: {video.get('video_title', 'Unknown')}")
+        # youtube_videos already has full details including youtube_id (from add_candidates).
+        # The recommender builds these dicts fresh for this call, so they are returned as-is.
+        youtube_with_ids = [video for video in youtube_videos if video.get('youtube_id')]
+        if debug_enabled(self.logger):
+            for video in youtube_with_ids:
+                self.logger.debug("Retrieved YouTube video with ID %s: %s", video.get('youtube_id'), video.get('video_title', 'Unknown'))
         
-        self.logger.info(f"Successfully processed {len(youtube_with_ids)} YouTube videos")
-        return youtube_with_ids
\ No newline at end of file
+        _PROJECT_DATA_CACHE.pop(project_id)
+        self.logger.info("Successfully processed %s YouTube videos", len(youtube_with_ids))
+        return youtube_with_ids
+
+def get_task_manager():
+    """
+    Return this request's TaskManager, creating it on first use.
+
+    A TaskManager holds MySQL connections (its own and its generators'), so it is never
+    shared between requests; close_task_manager hands them back to the pool when the
+    request ends (for a streamed response, once the stream finishes).
+    """
+    task_manager = g.get('task_manager')
+    if task_manager is None:
+        task_manager = g.task_manager = TaskManager()
+    return task_manager
+
+def close_task_manager(exc=None):
+    """teardown_request hook: close the request's TaskManager, if it built one."""
+    task_manager = g.pop('task_manager', None)
+    if task_manager is not None:
+        task_manager.close()
@@ -1,29 +1,102 @@
-import os
-from typing import Dict, Any, Optional, List
-import openai
-from openai import OpenAI
-import json
+import base64
+import threading
+from array import array
+from collections import OrderedDict
+from typing import List
 from langchain_openai import OpenAIEmbeddings
 import numpy as np
 
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# The embeddings endpoint accepts at most this many inputs per request
+_MAX_INPUTS_PER_REQUEST = 2048
+
+# One OpenAIEmbeddings client (and its HTTP connection pool) for the whole process;
+# Embedding instances are cheap wrappers around it
+_embeddings = None
+_embeddings_lock = threading.Lock()
+
+# Embeddings already fetched, keyed by (model, text), least recently used evicted first.
+# Held as packed float32 (the precision the VECTOR columns store) rather than lists of
+# Python floats, a quarter of the memory per cached vector; callers get fresh lists.
+_EMBEDDING_CACHE_SIZE = 1024
+_embedding_cache: "OrderedDict[tuple, array]" = OrderedDict()
+_embedding_cache_lock = threading.Lock()
+
+def _get_embeddings() -> OpenAIEmbeddings:
+    """Return the module-wide embeddings client, creating it on first call."""
+    global _embeddings
+    if _embeddings is None:
+        with _embeddings_lock:
+            if _embeddings is None:
+                _embeddings = OpenAIEmbeddings(model=EMBEDDING_MODEL)
+    return _embeddings
+
+def _decode_embedding(data: str) -> array:
+    """Unpack a base64-encoded embedding (little-endian float32) without parsing any floats."""
+    vector = array('f')
+    vector.frombytes(base64.b64decode(data))
+    return vector
+
+def _request_embeddings(texts: List[str]) -> List[array]:
+    """
+    Embed texts with a single API request, in input order.
+    The vectors are requested base64-encoded, so the response carries raw float32 bytes
+    instead of 1536 floats per text as JSON text.
+    """
+    response = _get_embeddings().client.create(input=texts, model=EMBEDDING_MODEL, encoding_format="base64")
+    return [_decode_embedding(item.embedding) for item in sorted(response.data, key=lambda item: item.index)]
+
 class Embedding:
-    def __init__(self):
-        self._embeddings = None  # Lazy initialization
-    
     @property
     def embeddings(self):
-        if self._embeddings is None:
-            self._embeddings = OpenAIEmbeddings(model="text-embedding-3-small")
-        return self._embeddings
+        return _get_embeddings()
 
     def embed_text(self, text: str) -> List[float]:
-        try:
-            return self.embeddings.embed_query(text)
-        except Exception as e:
-            raise e
-    
+        return self.embed_texts([text])[0]
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed several texts, one list of floats per text in input order.
+        Texts embedded before are served from the cache; the rest go out together, one
+        API request per _MAX_INPUTS_PER_REQUEST texts instead of one per text.
+        """
+        vectors = {}
+        misses = []
+        with _embedding_cache_lock:
+            for text in dict.fromkeys(texts):
+                vector = _embedding_cache.get((EMBEDDING_MODEL, text))
+                if vector is None:
+                    misses.append(text)
+                else:
+                    _embedding_cache.move_to_end((EMBEDDING_MODEL, text))
+                    vectors[text] = vector
+
+        for start in range(0, len(misses), _MAX_INPUTS_PER_REQUEST):
+            batch = misses[start:start + _MAX_INPUTS_PER_REQUEST]
+            fetched = _request_embeddings(batch)
+            with _embedding_cache_lock:
+                for text, vector in zip(batch, fetched):
+                    _embedding_cache[(EMBEDDING_MODEL, text)] = vector
+                    if len(_embedding_cache) > _EMBEDDING_CACHE_SIZE:
+                        _embedding_cache.popitem(last=False)
+            vectors.update(zip(batch, fetched))
+
+        return [vectors[text].tolist() for text in texts]
+
     def cosine_similarity(self,vec1, vec2):
         dot_product=np.dot(vec1,vec2)
         norm_a=np.linalg.norm(vec1)
         norm_b=np.linalg.norm(vec2)
-        return dot_product/(norm_a * norm_b)
\ No newline at end of file
+        return dot_product/(norm_a * norm_b)
+
+    def cosine_similarity_batch(self, query, corpus) -> np.ndarray:
+        """
+        Cosine similarity of one query vector against every row of corpus (N x d),
+        as a single matrix-vector product instead of N separate cosine_similarity calls.
+        """
+        q = np.asarray(query, dtype=np.float32)
+        M = np.asarray(corpus, dtype=np.float32)
+        q = q / np.linalg.norm(q)
+        M = M / np.linalg.norm(M, axis=1, keepdims=True)
+        return M @ q
@@ -0,0 +1,23 @@
+"""
+Fire-and-forget execution for work the HTTP response does not wait on (e.g. cache writes).
+"""
+
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from .logging_config import get_logger
+
+logger = get_logger(__name__)
+
+# One worker keeps background writes serialized and off the request threads
+_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="background")
+
+def _log_failure(future: Future) -> None:
+    error = future.exception()
+    if error is not None:
+        logger.error(f"Background task failed: {error}")
+
+def submit_background(fn, *args, **kwargs) -> Future:
+    """Run fn(*args, **kwargs) on the background worker; failures are logged, not raised."""
+    future = _EXECUTOR.submit(fn, *args, **kwargs)
+    future.add_done_callback(_log_failure)
+    return future
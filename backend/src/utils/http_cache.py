@@ -0,0 +1,28 @@
+"""
+HTTP caching headers for GET endpoints whose payload does not change once stored.
+"""
+
+from functools import wraps
+
+from flask import make_response, request
+
+def etag_cached(max_age: int = 86400):
+    """
+    Decorator adding an ETag and a public Cache-Control to successful responses.
+
+    The ETag is a hash of the response body, so a repeat request carrying a matching
+    If-None-Match gets an empty 304 instead of the payload. Error responses are left
+    uncached.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            response = make_response(view(*args, **kwargs))
+            if response.status_code != 200:
+                return response
+            response.add_etag()
+            response.cache_control.public = True
+            response.cache_control.max_age = max_age
+            return response.make_conditional(request)
+        return wrapper
+    return decorator
@@ -0,0 +1,12 @@
+"""
+Process-wide HTTP session for upstream APIs (YouTube Data API, arXiv).
+Sharing one session keeps connections alive across requests instead of re-handshaking per call.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+HTTP_SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=20, pool_maxsize=50)
+HTTP_SESSION.mount("https://", _adapter)
+HTTP_SESSION.mount("http://", _adapter)
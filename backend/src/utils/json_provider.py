@@ -0,0 +1,41 @@
+"""
+Flask JSON provider backed by orjson.
+Installed on the app so jsonify(), request.get_json() and current_app.json all use it.
+"""
+
+import orjson
+from flask.json.provider import DefaultJSONProvider
+
+# Non-str keys are stringified like the json module does; datetimes are passed to
+# Flask's default() so they keep the HTTP-date format clients already receive.
+# numpy scalars/arrays (recommender scores, embeddings) are encoded natively.
+_BASE_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY
+
+class OrjsonProvider(DefaultJSONProvider):
+    """DefaultJSONProvider with orjson doing the encoding and decoding."""
+
+    def _encode(self, obj, sort_keys: bool, indent) -> bytes:
+        option = _BASE_OPTIONS
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs) -> str:
+        # separators/ensure_ascii are not applicable: orjson always writes compact UTF-8
+        return self._encode(obj, kwargs.get("sort_keys", self.sort_keys), kwargs.get("indent")).decode()
+
+    def dumps_bytes(self, obj) -> bytes:
+        """Serialize straight to UTF-8 bytes, for callers writing to the response body."""
+        return self._encode(obj, self.sort_keys, None)
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        pretty = (self.compact is None and self._app.debug) or self.compact is False
+        return self._app.response_class(
+            self._encode(obj, self.sort_keys, pretty) + b"\n", mimetype=self.mimetype
+        )
@@ -1,42 +1,288 @@
 """
 Centralized logging configuration for MemoScholar backend.
 This module provides a consistent logging setup across all backend modules.
+
+Log arguments are only rendered when a record is actually emitted, so pass values as
+%-style arguments rather than building f-strings. For an argument that is itself costly
+to compute, wrap it in LazyFormat so the work is skipped when the level is disabled:
+
+    logger.debug("result=%s", LazyFormat(lambda: orjson.dumps(big_obj).decode()))
+
+and gate multi-statement diagnostics with `if debug_enabled(logger): ...`.
 """
 
+import atexit
 import logging
+import logging.handlers
+import os
+import queue
 import sys
-from typing import Optional
+import threading
+import time
+from functools import lru_cache
+from typing import Optional, Union
+
+import orjson
+
+# Marks the root handler installed by setup_logging, so repeat calls (including from a
+# re-imported copy of this module) find it and leave the configuration alone
+_HANDLER_MARK = '_memoscholar'
+
+# Set once stdout's encoding has been checked (see _ensure_utf8_stdout)
+_stdout_reconfigured = False
+
+# Background thread that writes queued records to stdout (see setup_logging)
+_listener: Optional[logging.handlers.QueueListener] = None
+
+# Thread that flushes the buffered stdout handler periodically, and the event that stops it
+_flusher: Optional[threading.Thread] = None
+_flusher_stop: Optional[threading.Event] = None
+
+# Level names accepted by setup_logging, resolved without a lookup on the logging module
+_LEVELS = {name: getattr(logging, name) for name in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")}
+
+# Buffered output is written once this many bytes are pending, or every interval
+_BUFFER_SIZE = 64 * 1024
+_FLUSH_INTERVAL = 0.1
+
+class _BufferedStreamHandler(logging.StreamHandler):
+    """
+    StreamHandler that collects formatted records and writes them out together.
+
+    Records are appended, UTF-8 encoded, to one reusable bytearray rather than collected
+    as strings to join. The buffer is written with a single write() once it reaches
+    `capacity` bytes, as soon as an ERROR (or worse) record arrives, or whenever flush()
+    is called (every _FLUSH_INTERVAL seconds by setup_logging's flusher thread).
+
+    When the stream has a file descriptor, the batch is handed to os.write() directly,
+    skipping the stream's own encoding and buffering layers.
+    Streams without one (e.g. a StringIO) and Windows consoles, which need the stream to
+    translate the text, are written through the stream as usual.
+    """
+
+    def __init__(self, stream=None, capacity: int = _BUFFER_SIZE):
+        super().__init__(stream)
+        self.capacity = capacity
+        self._buffer = bytearray()
+        try:
+            self._fd = self.stream.fileno()
+            if os.name == 'nt' and self.stream.isatty():
+                self._fd = None
+        except (AttributeError, OSError, ValueError):
+            self._fd = None
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            msg = (self.format(record) + self.terminator).encode('utf-8', 'backslashreplace')
+        except Exception:
+            self.handleError(record)
+            return
+        with self.lock:
+            self._buffer += msg
+            if len(self._buffer) < self.capacity and record.levelno < logging.ERROR:
+                return
+        self.flush()
+
+    def flush(self) -> None:
+        with self.lock:
+            if self._buffer:
+                data = bytes(self._buffer)
+                self._buffer.clear()
+                if self._fd is not None:
+                    self._write_fd(data)
+                    return
+                self.stream.write(data.decode('utf-8'))
+            if self.stream and hasattr(self.stream, "flush"):
+                self.stream.flush()
+
+    def _write_fd(self, data: bytes) -> None:
+        """Write data to the stream's file descriptor, falling back to the stream if it would block."""
+        # Anything print()ed is still in the stream's own buffer; let it out first so the
+        # output stays in order
+        self.stream.flush()
+        payload = memoryview(data)
+        try:
+            # os.write may take only part of the payload (e.g. on a full pipe)
+            while payload:
+                payload = payload[os.write(self._fd, payload):]
+        except BlockingIOError:
+            self.stream.write(bytes(payload).decode('utf-8', 'replace'))
+            self.stream.flush()
+
+class _CachingFormatter(logging.Formatter):
+    """
+    Formatter that caches timestamps per second: records logged within the same second
+    share one localtime()/strftime() result and only append their own milliseconds.
+    """
+
+    _time_cache = (None, None, None)  # (second, datefmt, formatted second)
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:
+        second = int(record.created)
+        cached_second, cached_datefmt, base = self._time_cache
+        if cached_second != second or cached_datefmt != datefmt:
+            base = time.strftime(datefmt or self.default_time_format, self.converter(record.created))
+            # One tuple, replaced whole, so concurrent readers never see a mixed entry
+            self._time_cache = (second, datefmt, base)
+        if datefmt or not self.default_msec_format:
+            return base
+        return self.default_msec_format % (base, record.msecs)
+
+class JsonFormatter(logging.Formatter):
+    """
+    Renders each record as one JSON object per line (NDJSON) for machine log sinks,
+    serialized by orjson instead of %-substituting a text format. A traceback goes in
+    its own "exc" field.
+    """
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": record.created,
+            "lvl": record.levelname,
+            "name": record.name,
+            "msg": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return orjson.dumps(entry).decode()
+
+class _FastQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that does only the work that must happen on the logging thread.
+
+    The message is rendered from its args (and any traceback to text) before the record
+    is queued, so later changes to a mutable argument cannot show up in the log. Unlike
+    the stock prepare(), the record is neither copied nor run through a formatter; the
+    timestamp and layout are left to the listener's handler.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.args:
+            record.msg = record.getMessage()
+            record.args = None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = _make_formatter('%(message)s').formatException(record.exc_info)
+            # The traceback holds every frame's locals alive; the text is all that's needed
+            record.exc_info = None
+        return record
+
+@lru_cache(maxsize=8)
+def _make_formatter(fmt: str) -> logging.Formatter:
+    """One Formatter per format string, so its parsed style is built only once."""
+    return _CachingFormatter(fmt)
+
+def _flush_periodically(handler: logging.Handler, stop: threading.Event) -> None:
+    """Flush handler every _FLUSH_INTERVAL seconds until stop is set, so buffered records never sit for long."""
+    while not stop.wait(_FLUSH_INTERVAL):
+        handler.flush()
+
+def _ensure_utf8_stdout() -> None:
+    """
+    Switch stdout to UTF-8 so Unicode in log messages can always be written (e.g. on a
+    Windows console or pipe). Applied at most once, and skipped when stdout already is
+    UTF-8, since reconfigure() flushes and resets the stream.
+    """
+    global _stdout_reconfigured
+    if _stdout_reconfigured:
+        return
+    _stdout_reconfigured = True
+    encoding = (getattr(sys.stdout, 'encoding', None) or '').lower().replace('-', '').replace('_', '')
+    if encoding != 'utf8' and hasattr(sys.stdout, 'reconfigure'):
+        sys.stdout.reconfigure(encoding='utf-8')
 
-def setup_logging(level: str = "INFO", log_format: Optional[str] = None) -> None:
+def setup_logging(level: Union[str, int] = "INFO", log_format: Optional[str] = None, reset: bool = False,
+                  json_lines: bool = False) -> None:
     """
     Configure logging for the entire backend application.
     
     Args:
-        level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
+        level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL), or its numeric value (e.g. logging.DEBUG)
         log_format: Custom log format string. If None, uses default format.
+        reset: Tear down the existing root handlers and configure from scratch.
+        json_lines: Write one JSON object per record (see JsonFormatter) instead of log_format.
+
+    Once our handler is on the root logger, later calls return immediately unless reset.
+
+    Loggers only put records on a queue; a QueueListener thread does the actual stdout
+    writes, so request threads never block on I/O when they log.
     """
+    global _listener, _flusher, _flusher_stop
+    root = logging.getLogger()
+    if reset:
+        if _flusher is not None:
+            _flusher_stop.set()
+            _flusher.join()
+            _flusher = _flusher_stop = None
+        if _listener is not None:
+            # Write out everything the old pipeline still holds before replacing it
+            _listener.stop()
+            atexit.unregister(_listener.stop)
+            for handler in _listener.handlers:
+                handler.flush()
+                atexit.unregister(handler.flush)
+            _listener = None
+        for handler in root.handlers[:]:
+            root.removeHandler(handler)
+            handler.close()
+    elif any(getattr(handler, _HANDLER_MARK, False) for handler in root.handlers):
+        return
+
     if log_format is None:
         log_format = '[%(asctime)s] %(levelname)s in %(name)s: %(message)s'
     
     # Convert string level to logging constant
-    numeric_level = getattr(logging, level.upper(), logging.INFO)
+    numeric_level = level if isinstance(level, int) else _LEVELS.get(level.upper(), logging.INFO)
     
-    # Create a stream handler with UTF-8 encoding to handle Unicode characters
-    stream_handler = logging.StreamHandler(sys.stdout)
+    # Create a stream handler with UTF-8 encoding to handle Unicode characters; records are
+    # batched into one stdout write instead of one write per record
+    stream_handler = _BufferedStreamHandler(sys.stdout)
+    if stream_handler._fd is None:
+        # Written through the stream itself, so its encoding must handle any Unicode
+        _ensure_utf8_stdout()
     stream_handler.setLevel(numeric_level)
-    stream_handler.setFormatter(logging.Formatter(log_format))
+    stream_handler.setFormatter(JsonFormatter() if json_lines else _make_formatter(log_format))
     
-    # Configure root logger with UTF-8 encoding
-    logging.basicConfig(
-        level=numeric_level,
-        format=log_format,
-        handlers=[stream_handler],
-        force=True  # Override any existing configuration
+    # The root logger renders each message and enqueues it; stream_handler does the rest
+    # of the formatting on the listener thread
+    log_queue = queue.SimpleQueue()
+    queue_handler = _FastQueueHandler(log_queue)
+    setattr(queue_handler, _HANDLER_MARK, True)
+    root.setLevel(numeric_level)
+    root.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    _flusher_stop = threading.Event()
+    _flusher = threading.Thread(
+        target=_flush_periodically, args=(stream_handler, _flusher_stop), name="log-flush", daemon=True
     )
-    
-    # Set encoding for stdout to handle Unicode characters
-    if hasattr(sys.stdout, 'reconfigure'):
-        sys.stdout.reconfigure(encoding='utf-8')
+    _flusher.start()
+    # Drain whatever is still queued, then write out the buffer, before the interpreter
+    # exits (atexit runs these in reverse order of registration)
+    atexit.register(stream_handler.flush)
+    atexit.register(_listener.stop)
+
+class LazyFormat:
+    """Log argument whose text comes from fn(), called only if the record is formatted."""
+
+    __slots__ = ("fn",)
+
+    def __init__(self, fn):
+        self.fn = fn
+
+    def __str__(self) -> str:
+        return str(self.fn())
+
+def debug_enabled(logger: logging.Logger) -> bool:
+    """True if logger would emit DEBUG records, for gating debug-only work."""
+    return logger.isEnabledFor(logging.DEBUG)
+
+@lru_cache(maxsize=256)
+def _cached_logger(name: str) -> logging.Logger:
+    # Loggers live for the whole process, so repeat lookups skip logging's module lock
+    return logging.getLogger(name)
 
 def get_logger(name: str) -> logging.Logger:
     """
@@ -48,7 +294,8 @@ def get_logger(name: str) -> logging.Logger:
     Returns:
         Configured logger instance
     """
-    return logging.getLogger(name)
+    return _cached_logger(name)
 
-# Initialize logging when this module is imported
-setup_logging()
+# Initialize logging when this module is imported; LOG_LEVEL=WARNING skips info-level
+# formatting entirely (e.g. in production), MEMOSCHOLAR_LOG_JSON=1 switches to JSON lines
+setup_logging(os.getenv('LOG_LEVEL', 'INFO'), json_lines=os.getenv('MEMOSCHOLAR_LOG_JSON') == '1')
@@ -0,0 +1,77 @@
+"""
+Small thread-safe in-process cache with per-entry expiry and LRU eviction.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+class TTLCache:
+    """LRU cache whose entries expire `ttl` seconds after they were stored."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        # Invalidation counters for set_if_unchanged: per key (bumped by pop, most recent
+        # maxsize keys kept) and for the whole cache (bumped by clear)
+        self._generations: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._epoch = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._store(key, value)
+
+    def token(self, key: Hashable) -> tuple:
+        """Take before a slow read of key's value; pass it to set_if_unchanged afterwards."""
+        with self._lock:
+            return (self._epoch, self._generations.get(key, 0))
+
+    def set_if_unchanged(self, key: Hashable, value: Any, token: tuple) -> bool:
+        """
+        Store value only if key was not popped (and the cache not cleared) since token was
+        taken, so a read that raced with a write cannot cache what the write replaced.
+        """
+        with self._lock:
+            if (self._epoch, self._generations.get(key, 0)) != token:
+                return False
+            self._store(key, value)
+            return True
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+            self._generations[key] = self._generations.get(key, 0) + 1
+            self._generations.move_to_end(key)
+            if len(self._generations) > self.maxsize:
+                self._generations.popitem(last=False)
+                # The dropped key's counter would restart at 0, so retire every outstanding token
+                self._epoch += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._generations.clear()
+            self._epoch += 1
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        """Insert or refresh an entry; the caller holds the lock."""
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        self._data.move_to_end(key)
+        if len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
@@ -0,0 +1,101 @@
+"""
+Shared request-body validation for the API routes.
+Each route builds its validators once at import time and calls them per request.
+"""
+
+from operator import itemgetter
+from typing import Iterable, Optional
+
+def _is_filled(value) -> bool:
+    """True unless the value is falsy or a whitespace-only string."""
+    if isinstance(value, str):
+        # isspace() scans in place; strip() would allocate a copy just to test emptiness
+        return bool(value) and not value.isspace()
+    return bool(value)
+
+class RequiredFields:
+    """
+    Checks that a JSON body carries a fixed set of fields.
+
+    The field set and getter are built once, so the common (valid) case is a set
+    comparison plus one itemgetter call; fields are only walked in order to report
+    the first failing one.
+    """
+
+    def __init__(self, fields: Iterable[str], non_empty: bool = True):
+        self.fields = tuple(fields)
+        self.non_empty = non_empty
+        self._keys = frozenset(self.fields)
+        self._getter = itemgetter(*self.fields)
+
+    def error(self, data) -> Optional[str]:
+        """Return an error message for the first missing (or empty) field, or None if valid."""
+        if not self._keys <= data.keys():
+            for field in self.fields:
+                if field not in data:
+                    return self._message(field)
+
+        if self.non_empty:
+            values = self._getter(data)
+            if len(self.fields) == 1:
+                values = (values,)
+            if not all(map(_is_filled, values)):
+                for field, value in zip(self.fields, values):
+                    if not _is_filled(value):
+                        return self._message(field)
+        return None
+
+    def _message(self, field: str) -> str:
+        if self.non_empty:
+            return f'Missing or empty required field: {field}'
+        return f'Missing required field: {field}'
+
+class NotNullFields(RequiredFields):
+    """Checks that fields are present and not None (0 and empty strings are allowed)."""
+
+    def error(self, data) -> Optional[str]:
+        if self._keys <= data.keys():
+            values = self._getter(data)
+            if len(self.fields) == 1:
+                values = (values,)
+            if None not in values:
+                return None
+        for field in self.fields:
+            if data.get(field) is None:
+                return f'Missing required field: {field}'
+        return None
+
+# Like/dislike bodies are checked both by the route and by TaskManager (see like_error)
+LIKE_FIELDS = RequiredFields(["project_id", "target_type", "target_id", "isLiked"], non_empty=False)
+LIKE_TARGET_TYPES = frozenset(('youtube', 'paper'))
+
+def like_error(data) -> Optional[str]:
+    """Return an error message for an invalid like/dislike body, or None if valid."""
+    error = LIKE_FIELDS.error(data)
+    if error:
+        return error
+    if data['target_type'] not in LIKE_TARGET_TYPES:
+        return 'target_type must be either "youtube" or "paper"'
+    if not isinstance(data['isLiked'], bool):
+        return 'isLiked must be a boolean value'
+    return None
+
+# Like/dislike toggle bodies, likewise checked by the route and by TaskManager
+LIKE_UPDATE_FIELDS = RequiredFields(["liked_disliked_id"], non_empty=False)
+
+def _positive_int(value) -> Optional[int]:
+    """value as an int if it converts to a positive one, else None."""
+    try:
+        number = int(value)
+    except (ValueError, TypeError):
+        return None
+    return number if number > 0 else None
+
+def like_update_error(data) -> Optional[str]:
+    """Return an error message for an invalid like/dislike update body, or None if valid."""
+    error = LIKE_UPDATE_FIELDS.error(data)
+    if error:
+        return error
+    if _positive_int(data['liked_disliked_id']) is None:
+        return 'liked_disliked_id must be a positive integer'
+    return None
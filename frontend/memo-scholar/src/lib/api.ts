@@ -11,6 +11,47 @@ export async function generateSubmission(topic: string, objective: string, guide
   return res.json();
 }
 
+export type SubmissionStreamEvent = "project" | "youtube" | "papers" | "done" | "error";
+
+// Same request as generateSubmission, but results arrive as server-sent events: each panel is
+// handed to onEvent as soon as the backend finishes it. Resolves after the stream ends.
+export async function streamSubmission(
+  topic: string,
+  objective: string,
+  guidelines: string,
+  user_id: number,
+  onEvent: (event: SubmissionStreamEvent, data: any) => void
+) {
+  const payload = { topic, objective, guidelines, user_id: user_id.toString() };
+  const res = await fetch("/api/generate_submission/stream/", {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+  });
+  if (!res.ok || !res.body) throw new Error("Generate submission stream failed");
+
+  const reader = res.body.getReader();
+  const decoder = new TextDecoder();
+  let buffer = "";
+  for (;;) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const frame = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      let event = "message";
+      let data = "";
+      for (const line of frame.split("\n")) {
+        if (line.startsWith("event: ")) event = line.slice(7);
+        else if (line.startsWith("data: ")) data += line.slice(6);
+      }
+      onEvent(event as SubmissionStreamEvent, data ? JSON.parse(data) : null);
+    }
+  }
+}
+
 export async function generateSubmissionIndividualPanel(topic: string, objective: string, guidelines: string, user_special_instructions: string, panel_name: string, user_id: number, project_id: number, query_id: number) {
   const payload = { topic, objective, guidelines, user_special_instructions, panel_name, user_id: user_id.toString(), project_id, query_id };
   const res = await fetch("/api/generate_submission/individual_panel/", {
@@ -144,6 +185,37 @@ export async function getYoutubeVideo(youtubeId: number): Promise<any> {
   return response.video;
 }
 
+// Batch lookups accept at most this many ids per request (MAX_BATCH_IDS on the server)
+const MAX_BATCH_IDS = 100;
+
+async function postBatch(url: string, ids: number[], key: string, errorMessage: string): Promise<Record<number, any>> {
+  const chunks: number[][] = [];
+  for (let i = 0; i < ids.length; i += MAX_BATCH_IDS) {
+    chunks.push(ids.slice(i, i + MAX_BATCH_IDS));
+  }
+  const results = await Promise.all(chunks.map(async (chunk) => {
+    const res = await fetch(url, {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ ids: chunk }),
+    });
+    if (!res.ok) throw new Error(errorMessage);
+    const response = await res.json();
+    return response[key] || {};
+  }));
+  return Object.assign({}, ...results);
+}
+
+export async function getYoutubeVideos(youtubeIds: number[]): Promise<Record<number, any>> {
+  if (youtubeIds.length === 0) return {};
+  return postBatch("/api/youtube/batch", youtubeIds, "videos", "Failed to get YouTube videos");
+}
+
+export async function getPapers(paperIds: number[]): Promise<Record<number, any>> {
+  if (paperIds.length === 0) return {};
+  return postBatch("/api/papers/batch", paperIds, "papers", "Failed to get papers");
+}
+
 export async function getPaper(paperId: number): Promise<any> {
   const res = await fetch(`/api/papers/${paperId}`, {
     method: "GET",
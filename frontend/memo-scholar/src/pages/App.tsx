@@ -51,6 +51,11 @@ export default function App() {
     setHasRun(true);
   };
 
+  // Streamed submissions deliver each panel after the project screen is already open
+  const handlePanelItems = (kind: "youtube" | "paper", items: Item[]) => {
+    setProjectData(prev => prev && (kind === "youtube" ? { ...prev, youtubeItems: items } : { ...prev, paperItems: items }));
+  };
+
   const handleBackToSetup = () => {
     setHasRun(false);
     // Don't reset projectData to preserve regenerated items
@@ -76,7 +81,7 @@ export default function App() {
   };
 
   if (!hasRun || !projectData) {
-    return <Project onProjectComplete={handleProjectComplete} user={user} onUserLogin={handleUserLogin} onUserLogout={handleUserLogout} />;
+    return <Project onProjectComplete={handleProjectComplete} onPanelItems={handlePanelItems} user={user} onUserLogin={handleUserLogin} onUserLogout={handleUserLogout} />;
   }
 
   return (
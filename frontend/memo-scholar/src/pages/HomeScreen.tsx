@@ -4,7 +4,7 @@ import { Panel } from "@/components/ui/panel";
 import { HeaderBar } from "@/components/ui/header_bar";
 import { ManagementPanel } from "@/components/ui/management_panel";
 import SimpleLogin from "@/components/ui/simple-login";
-import { updateLikeStatus, getProjectLikes, getYoutubeVideo, getPaper } from "@/lib/api";
+import { updateLikeStatus, getProjectLikes, getYoutubeVideos, getPapers } from "@/lib/api";
 import type { Item, UserProfile } from "@/types";
 
 interface HomeScreenProps {
@@ -65,7 +65,29 @@ export default function HomeScreen({
       const nextLiked: Item[] = [];
       const nextDisliked: Item[] = [];
 
-      // Fetch each liked/disliked item from the database
+      // Fetch every liked/disliked item that is not already on screen in one request per type
+      const youtubeIdsToFetch: number[] = [];
+      const paperIdsToFetch: number[] = [];
+      for (const [, like] of latestByKey) {
+        if (like.target_type === 'youtube') {
+          if (!youtubeItems.some(item => item.database_id === like.target_id)) {
+            youtubeIdsToFetch.push(like.target_id);
+          }
+        } else if (like.target_type === 'paper') {
+          paperIdsToFetch.push(like.target_id);
+        }
+      }
+      const [fetchedVideos, fetchedPapers] = await Promise.all([
+        getYoutubeVideos(youtubeIdsToFetch).catch((error) => {
+          console.error('Failed to fetch YouTube videos:', error);
+          return {} as Record<number, any>;
+        }),
+        getPapers(paperIdsToFetch).catch((error) => {
+          console.error('Failed to fetch papers:', error);
+          return {} as Record<number, any>;
+        }),
+      ]);
+
       for (const [, like] of latestByKey) {
         try {
           let itemData: any = null;
@@ -87,8 +109,8 @@ export default function HomeScreen({
                 video_url: existingItem.meta.video_url
               };
             } else {
-              // Try to get from youtube table
-              itemData = await getYoutubeVideo(like.target_id);
+              // Otherwise use the row fetched from the youtube table above
+              itemData = fetchedVideos[like.target_id] ?? null;
               console.log(`📺 Result from youtube table:`, itemData ? 'Found' : 'Not found');
             }
             
@@ -118,7 +140,7 @@ export default function HomeScreen({
               }
             }
           } else if (like.target_type === 'paper') {
-            itemData = await getPaper(like.target_id);
+            itemData = fetchedPapers[like.target_id] ?? null;
             if (itemData) {
               // Convert database format to Item format
               const item: Item = {
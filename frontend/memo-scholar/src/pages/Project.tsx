@@ -6,17 +6,18 @@ import { Textarea } from "@/components/ui/textarea";
 import { HeaderBar } from "@/components/ui/header_bar";
 import SimpleLogin from "@/components/ui/simple-login";
 import ConversationsSidebar from "@/components/ui/conversations-sidebar";
-import { generateSubmission, getCompleteProjectData } from "@/lib/api";
+import { streamSubmission, getCompleteProjectData } from "@/lib/api";
 import type { Item, UserProfile, DatabaseProject } from "@/types";
 
 interface ProjectProps {
   onProjectComplete: (topic: string, objective: string, guidelines: string, youtubeItems: Item[], paperItems: Item[], project_id: number, query_id: number) => void;
+  onPanelItems: (kind: "youtube" | "paper", items: Item[]) => void;
   user: UserProfile | null;
   onUserLogin: (user: UserProfile) => void;
   onUserLogout: () => void;
 }
 
-export default function Project({ onProjectComplete, user, onUserLogin, onUserLogout }: ProjectProps) {
+export default function Project({ onProjectComplete, onPanelItems, user, onUserLogin, onUserLogout }: ProjectProps) {
   const [topic, setTopic] = useState("");
   const [objective, setObjective] = useState("");
   const [guidelines, setGuidelines] = useState("");
@@ -138,60 +139,33 @@ export default function Project({ onProjectComplete, user, onUserLogin, onUserLo
     console.log("Run button clicked!"); // Debug log
     console.log("Payload:", { topic, objective, guidelines, user_id: user.user_id }); // Debug log
     try { 
-      console.log("Calling generateSubmission API...");
-      const result = await generateSubmission(topic, objective, guidelines, user.user_id); 
-      console.log("Submission generated:", result);
-      console.log("YouTube array:", result.youtube);
-      console.log("Papers array:", result.papers);
-      console.log("Project ID:", result.project_id);
-      
-      // Debug: Check if database IDs are present
-      if (result.youtube && result.youtube.length > 0) {
-        console.log("First YouTube video from backend:", result.youtube[0]);
-        console.log("YouTube video has youtube_id:", 'youtube_id' in result.youtube[0]);
-        console.log("YouTube video keys:", Object.keys(result.youtube[0]));
-      }
-      if (result.papers && result.papers.length > 0) {
-        console.log("First paper from backend:", result.papers[0]);
-        console.log("Paper has paper_id:", 'paper_id' in result.papers[0]);
-        console.log("Paper keys:", Object.keys(result.papers[0]));
-      } 
-      
-      // Handle the new API response format
-      if (result.success) {
-        const projectId = result.project_id;
-        const queryId = result.query_id;
-        
-        // Handle YouTube videos
-        if (result.youtube && Array.isArray(result.youtube)) {
-          const youtubeItems = result.youtube.map((video: any, index: number) => ({
+      console.log("Calling streamSubmission API...");
+      let projectId = 0;
+      // Each panel arrives as its own event; the project event opens the results screen
+      // right away and the panels fill in as the backend finishes them.
+      await streamSubmission(topic, objective, guidelines, user.user_id, (event, data) => {
+        console.log("Submission event:", event, data);
+        if (event === "project") {
+          projectId = data.project_id;
+          onProjectComplete(topic, objective, guidelines, [], [], data.project_id, data.query_id);
+        } else if (event === "youtube" && Array.isArray(data.youtube)) {
+          onPanelItems("youtube", data.youtube.map((video: any, index: number) => ({
             id: `youtube-${index}-${Date.now()}`,
             title: video.video_title,
             database_id: video.youtube_id, // Database ID for like/dislike
             target_type: "youtube" as const,
             project_id: projectId,
             meta: {
-              channel: "YouTube", // We could extract channel from video data if needed
+              channel: "YouTube",
               duration: video.video_duration,
               views: video.video_views,
               likes: video.video_likes,
               video_url: video.video_url
             },
             feedback: undefined as "accept" | "reject" | undefined
-          }));
-          
-          console.log("Created YouTube items with database info:", youtubeItems);
-          if (youtubeItems.length > 0) {
-            console.log("First YouTube item properties:", Object.keys(youtubeItems[0]));
-            console.log("First YouTube item database_id:", youtubeItems[0].database_id);
-            console.log("First YouTube item target_type:", youtubeItems[0].target_type);
-            console.log("First YouTube item project_id:", youtubeItems[0].project_id);
-          }
-        }
-        
-        // Handle papers
-        if (result.papers && Array.isArray(result.papers)) {
-          const paperItems = result.papers.map((paper: any, index: number) => ({
+          })));
+        } else if (event === "papers" && Array.isArray(data.papers)) {
+          onPanelItems("paper", data.papers.map((paper: any, index: number) => ({
             id: `paper-${index}-${Date.now()}`,
             title: paper.title,
             database_id: paper.paper_id, // Database ID for like/dislike
@@ -206,59 +180,12 @@ export default function Project({ onProjectComplete, user, onUserLogin, onUserLo
               summary: paper.summary
             },
             feedback: undefined as "accept" | "reject" | undefined
-          }));
-          
-          console.log("Created paper items with database info:", paperItems);
-          if (paperItems.length > 0) {
-            console.log("First paper item properties:", Object.keys(paperItems[0]));
-            console.log("First paper item database_id:", paperItems[0].database_id);
-            console.log("First paper item target_type:", paperItems[0].target_type);
-            console.log("First paper item project_id:", paperItems[0].project_id);
-          }
+          })));
+        } else if (event === "error") {
+          console.error("Submission error:", data.error);
+          setValidationError(data.error);
         }
-        
-        // Call the completion handler with the project details and generated items
-        onProjectComplete(
-          topic,
-          objective,
-          guidelines,
-          result.youtube ? result.youtube.map((video: any, index: number) => ({
-            id: `youtube-${index}-${Date.now()}`,
-            title: video.video_title,
-            database_id: video.youtube_id,
-            target_type: "youtube" as const,
-            project_id: projectId,
-            meta: {
-              channel: "YouTube",
-              duration: video.video_duration,
-              views: video.video_views,
-              likes: video.video_likes,
-              video_url: video.video_url
-            },
-            feedback: undefined as "accept" | "reject" | undefined
-          })) : [],
-          result.papers ? result.papers.map((paper: any, index: number) => ({
-            id: `paper-${index}-${Date.now()}`,
-            title: paper.title,
-            database_id: paper.paper_id,
-            target_type: "paper" as const,
-            project_id: projectId,
-            meta: {
-              venue: "ArXiv",
-              year: new Date(paper.published).getFullYear(),
-              authors: paper.authors ? paper.authors.join(', ') : 'Unknown',
-              link: paper.link,
-              pdf_link: paper.pdf_link,
-              summary: paper.summary
-            },
-            feedback: undefined as "accept" | "reject" | undefined
-          })) : [],
-          projectId,
-          queryId
-        );
-      } else if (result.error) {
-        setValidationError(result.error);
-      }
+      });
     }
     catch (e) { 
       console.error("Error generating submission:", e);